@@ -1,10 +1,34 @@
 --[[=============================================================================
-  Control4 Home Assistant Bridge (Lights MVP)
+  Control4 Home Assistant Bridge
 ===============================================================================]]
 
 local VERSION = "0.2.0"
+-- Starting intervals; HA adjusts them through pacing hints in its responses.
 local POLL_INTERVAL_SECONDS = 2
 local SYNC_INTERVAL_SECONDS = 15
+local MIN_POLL_MS = 200
+local MAX_POLL_MS = 60000
+local MIN_SYNC_MS = 5000
+local MAX_SYNC_MS = 300000
+local MAX_BATCH_SIZE = 100
+-- Recently executed command IDs kept to suppress redelivered commands.
+local EXECUTED_COMMAND_HISTORY = 512
+-- Success acks ride on the next poll; at most this many per request.
+local MAX_PIGGYBACK_ACKS = 50
+-- Push listener requests larger than this are dropped with the connection.
+local MAX_PUSH_REQUEST_BYTES = 262144
+-- Next attempt if a request never completes.
+local REQUEST_WATCHDOG_MS = 30000
+-- Device changes arriving within this window are pushed as one partial sync.
+local CHANGE_DEBOUNCE_MS = 75
+-- Button events older than this are dropped instead of firing automations late.
+local EVENT_MAX_AGE_SECONDS = 5
+local MAX_PENDING_EVENTS = 100
+-- Outgoing HTTP: at most this many requests at once, exponential backoff
+-- with jitter after failures.
+local MAX_REQUESTS_IN_FLIGHT = 2
+local BACKOFF_BASE_MS = 1000
+local BACKOFF_MAX_MS = 60000
 
 local BRIDGE_ID = "main_house"
 local SHARED_SECRET = ""
@@ -12,16 +36,185 @@ local HA_BASE_URL = "http://homeassistant.local:8123"
 local DEBUG_ENABLED = false
 local DEFAULT_ROOM_NAME = "Control4"
 
-local LIGHT_DEVICE_IDS = {}
-local LIGHT_STATE = {}
+local function number_field(field)
+  return function(state, value)
+    local number = tonumber(value)
+    if number ~= nil then
+      state[field] = number
+    end
+  end
+end
+
+local function is_true(value)
+  local text = string.lower(tostring(value))
+  return text == "1" or text == "true"
+end
+
+-- Control4 HVAC_STATE values ("Heat", "Stage 2 Cool", ...) -> hvac_action.
+local function hvac_action(value)
+  local text = string.lower(tostring(value))
+  for _, action in ipairs({ "heat", "cool", "fan", "off" }) do
+    if string.find(text, action, 1, true) then
+      return ({ heat = "heating", cool = "cooling" })[action] or action
+    end
+  end
+  return "idle"
+end
+
+-- Exported device classes. Each entry maps a Composer device selector to the
+-- bridge record type, default state and (below) its command handler.
+local DEVICE_CLASSES = {
+  {
+    type = "light",
+    selector_property = "Light Devices",
+    id_list_property = "Light Device IDs",
+    name_prefix = "C4 Light",
+    capabilities = {"on_off", "brightness"},
+    default_state = function() return { on = false, brightness = 0 } end,
+    -- Proxy variable ID (or name) -> state update; used for
+    -- C4:RegisterVariableListener and to read current values.
+    variables = {
+      [1000] = function(state, value) -- LIGHT_STATE
+        state.on = (tonumber(value) or 0) > 0
+      end,
+      [1001] = function(state, value) -- LIGHT_LEVEL
+        local level = math.max(0, math.min(100, math.floor((tonumber(value) or 0) + 0.5)))
+        state.brightness = level
+        state.on = level > 0
+      end,
+    },
+  },
+  {
+    type = "lock",
+    selector_property = "Lock Devices",
+    name_prefix = "C4 Lock",
+    capabilities = {"lock"},
+    default_state = function() return { lock_status = "unknown" } end,
+    variables = {
+      [1000] = function(state, value) -- LOCK_STATUS
+        state.lock_status = string.lower(tostring(value))
+      end,
+    },
+  },
+  {
+    type = "cover",
+    selector_property = "Cover Devices",
+    name_prefix = "C4 Cover",
+    capabilities = {"open_close", "stop", "position"},
+    default_state = function() return { position = 0, status = "closed" } end,
+    -- Blind proxy variable IDs vary by proxy version, so these are variable
+    -- names, resolved to IDs per device through C4:GetDeviceVariables.
+    variables = {
+      ["Level"] = function(state, value)
+        local position = math.max(0, math.min(100, math.floor((tonumber(value) or 0) + 0.5)))
+        state.position = position
+        if state.status ~= "opening" and state.status ~= "closing" then
+          state.status = (position == 0) and "closed" or "open"
+        end
+      end,
+      ["Opening"] = function(state, value)
+        if is_true(value) then state.status = "opening" end
+      end,
+      ["Closing"] = function(state, value)
+        if is_true(value) then state.status = "closing" end
+      end,
+      ["Stopped"] = function(state, value)
+        if is_true(value) then
+          state.status = ((state.position or 0) == 0) and "closed" or "open"
+        end
+      end,
+    },
+  },
+  {
+    type = "thermostat",
+    selector_property = "Thermostat Devices",
+    name_prefix = "C4 Thermostat",
+    capabilities = {"setpoint_heat", "setpoint_cool", "setpoint_range", "fan_mode"},
+    default_state = function() return { hvac_mode = "Off", hvac_action = "off", fan_mode = "Auto", scale = "F" } end,
+    -- Thermostat proxy variable names; Fahrenheit values, matching `scale`.
+    variables = {
+      ["HVAC_MODE"] = function(state, value) state.hvac_mode = tostring(value) end,
+      ["HVAC_STATE"] = function(state, value) state.hvac_action = hvac_action(value) end,
+      ["FAN_MODE"] = function(state, value) state.fan_mode = tostring(value) end,
+      ["TEMPERATURE_F"] = number_field("current_temperature"),
+      ["HEAT_SETPOINT_F"] = number_field("heat_setpoint"),
+      ["COOL_SETPOINT_F"] = number_field("cool_setpoint"),
+    },
+  },
+  {
+    -- Read-only meters and environment sensors; each numeric field becomes
+    -- an HA sensor once it has a value.
+    type = "sensor",
+    id_list_property = "Sensor Device IDs",
+    name_prefix = "C4 Sensor",
+    capabilities = {},
+    default_state = function() return { scale = "F" } end,
+    variables = {
+      ["TEMPERATURE_F"] = number_field("temperature"),
+      ["HUMIDITY"] = number_field("humidity"),
+      ["POWER"] = number_field("power"),
+      ["WATTS"] = number_field("power"),
+      ["ENERGY"] = number_field("energy"),
+      ["KWH"] = number_field("energy"),
+      ["ILLUMINANCE"] = number_field("illuminance"),
+      ["VOLTAGE"] = number_field("voltage"),
+      ["CURRENT"] = number_field("current"),
+      ["BATTERY_LEVEL"] = number_field("battery"),
+    },
+  },
+  {
+    -- Stateless; button actions arrive through the SendButtonEvent command.
+    type = "keypad",
+    selector_property = "Keypad Devices",
+    name_prefix = "C4 Keypad",
+    capabilities = {"buttons"},
+    default_state = function() return {} end,
+  },
+}
+
+local BUTTON_ACTIONS = { press = true, release = true, hold = true }
+
+local EXPORTED_DEVICE_IDS = {}
+local DEVICE_CLASS_BY_ID = {}
+local DEVICE_STATE = {}
+-- Serialized device records, rebuilt only when that device changes.
+local DEVICE_FRAGMENTS = {}
+-- device_id -> field -> {deadband, min_interval}, from the Sensor Throttle property
+local SENSOR_THROTTLE = {}
+local devices_json = nil
+local devices_hash = nil
+local pending_changes = {}
+local change_timer = nil
+local watched_variables = {}
+-- device_id -> { [proxy variable ID] = state update }, names resolved.
+local DEVICE_VARIABLES = {}
+local pending_events = {}
 
 local sync_timer = nil
 local poll_timer = nil
+local poll_interval_ms = POLL_INTERVAL_SECONDS * 1000
+local sync_interval_ms = SYNC_INTERVAL_SECONDS * 1000
+local command_batch_size = 25
+local full_sync_requested = false
+local sync_in_flight = false
+local schedule_poll
+local schedule_sync
 local command_ack_buffer = {}
+local executed_commands = {}
+local executed_ring = {}
+local executed_next = 1
+local push_port = 0
+local push_listener_port = 0
+local push_buffers = {}
 local HTTP_OPTIONS = {
   cookies_enable = false,
   fail_on_error = false,
 }
+local request_queue = {}
+local requests_in_flight = 0
+local consecutive_failures = 0
+local backoff_timer = nil
+local pump_requests
 
 local function debug_log(msg)
   if DEBUG_ENABLED then
@@ -67,6 +260,25 @@ local function parse_ids_from_selector(raw)
   return ids
 end
 
+-- "<device id>:<field>=<deadband>/<min interval>" entries, comma-separated
+-- (example: 2001:power=25/10,2001:energy=0.1/60).
+local function parse_sensor_throttle(raw)
+  local overrides = {}
+  for token in string.gmatch(tostring(raw or ""), "[^,]+") do
+    local entry = trim(token)
+    local device_id, field, deadband, min_interval =
+      entry:match("^(%d+)%s*:%s*([%w_]+)%s*=%s*([%d%.]+)%s*/%s*([%d%.]+)$")
+    if device_id and tonumber(deadband) and tonumber(min_interval) then
+      device_id = tostring(tonumber(device_id))
+      overrides[device_id] = overrides[device_id] or {}
+      overrides[device_id][field] = {deadband = tonumber(deadband), min_interval = tonumber(min_interval)}
+    elseif entry ~= "" then
+      info_log("Ignoring invalid Sensor Throttle entry: " .. entry)
+    end
+  end
+  return overrides
+end
+
 local function update_runtime_properties()
   local v = VERSION
   if C4.GetDriverConfigInfo then
@@ -85,108 +297,352 @@ local function load_properties()
   SHARED_SECRET = Properties["Shared Secret"] or ""
   HA_BASE_URL = Properties["Home Assistant Base URL"] or "http://homeassistant.local:8123"
   DEBUG_ENABLED = (Properties["Debug Mode"] == "On")
+  push_port = math.floor(tonumber(Properties["Command Push Port"]) or 0)
   DEFAULT_ROOM_NAME = trim(Properties["Default Room Name"] or "Control4")
   if DEFAULT_ROOM_NAME == "" then
     DEFAULT_ROOM_NAME = "Control4"
   end
 
-  local selector_ids = parse_ids_from_selector(Properties["Light Devices"])
-  if #selector_ids > 0 then
-    LIGHT_DEVICE_IDS = selector_ids
-  else
-    LIGHT_DEVICE_IDS = parse_id_list(Properties["Light Device IDs"])
+  EXPORTED_DEVICE_IDS = {}
+  DEVICE_CLASS_BY_ID = {}
+  DEVICE_FRAGMENTS = {}
+  devices_json = nil
+  SENSOR_THROTTLE = parse_sensor_throttle(Properties["Sensor Throttle"])
+  for _, class in ipairs(DEVICE_CLASSES) do
+    local ids = parse_ids_from_selector(Properties[class.selector_property])
+    if #ids == 0 and class.id_list_property then
+      ids = parse_id_list(Properties[class.id_list_property])
+    end
+    for _, id in ipairs(ids) do
+      if DEVICE_CLASS_BY_ID[id] == nil then
+        table.insert(EXPORTED_DEVICE_IDS, id)
+        DEVICE_CLASS_BY_ID[id] = class
+        if DEVICE_STATE[id] == nil then
+          DEVICE_STATE[id] = class.default_state()
+        end
+      end
+    end
   end
-  for _, id in ipairs(LIGHT_DEVICE_IDS) do
-    if LIGHT_STATE[id] == nil then
-      LIGHT_STATE[id] = { on = false, brightness = 0 }
+
+  debug_log("Loaded " .. tostring(#EXPORTED_DEVICE_IDS) .. " device IDs")
+end
+
+-- Class variables keyed by name are looked up in the device's variable list.
+local function resolve_variables(device_id, class)
+  local resolved = {}
+  local ids_by_name = nil
+  for key, update in pairs(class.variables or {}) do
+    if type(key) == "number" then
+      resolved[key] = update
+    else
+      if ids_by_name == nil then
+        ids_by_name = {}
+        local ok, variables = pcall(function() return C4:GetDeviceVariables(tonumber(device_id)) end)
+        if ok and type(variables) == "table" then
+          for variable_id, variable in pairs(variables) do
+            if type(variable) == "table" and variable.name ~= nil then
+              ids_by_name[tostring(variable.name)] = tonumber(variable_id)
+            end
+          end
+        end
+      end
+      if ids_by_name[key] ~= nil then
+        resolved[ids_by_name[key]] = update
+      end
+    end
+  end
+  return resolved
+end
+
+-- Applies the devices' current proxy variable values to their cached state.
+local function read_device_variables(device_id)
+  local state = DEVICE_STATE[device_id] or DEVICE_CLASS_BY_ID[device_id].default_state()
+  DEVICE_STATE[device_id] = state
+  for variable_id, update in pairs(DEVICE_VARIABLES[device_id] or {}) do
+    local ok, value = pcall(function() return C4:GetDeviceVariable(tonumber(device_id), variable_id) end)
+    if ok and value ~= nil then
+      update(state, value)
     end
   end
+end
 
-  debug_log("Loaded " .. tostring(#LIGHT_DEVICE_IDS) .. " light device IDs")
+local function watch_device_variables()
+  for _, watched in ipairs(watched_variables) do
+    pcall(function() C4:UnregisterVariableListener(watched.device, watched.variable) end)
+  end
+  watched_variables = {}
+  DEVICE_VARIABLES = {}
+
+  for _, device_id in ipairs(EXPORTED_DEVICE_IDS) do
+    local numeric_id = tonumber(device_id)
+    DEVICE_VARIABLES[device_id] = resolve_variables(device_id, DEVICE_CLASS_BY_ID[device_id])
+    if C4.RegisterVariableListener ~= nil then
+      for variable_id, _ in pairs(DEVICE_VARIABLES[device_id]) do
+        local ok = pcall(function() C4:RegisterVariableListener(numeric_id, variable_id) end)
+        if ok then
+          table.insert(watched_variables, { device = numeric_id, variable = variable_id })
+        end
+      end
+    end
+    -- The first snapshot carries current values rather than defaults.
+    read_device_variables(device_id)
+  end
 end
 
-local function auth_headers()
-  return {
+local function auth_headers(extra_headers)
+  local headers = {
     ["Content-Type"] = "application/json",
     ["X-C4-Bridge-Secret"] = SHARED_SECRET,
+    ["Connection"] = "keep-alive",
   }
+  -- Announces the command listener; HA pushes there while it answers.
+  if push_listener_port > 0 then
+    headers["X-C4-Push-Port"] = tostring(push_listener_port)
+  end
+  for key, value in pairs(extra_headers or {}) do
+    headers[key] = value
+  end
+  return headers
+end
+
+local function hash_hex(data)
+  if C4.Hash == nil then
+    return nil
+  end
+  local ok, digest = pcall(function()
+    return C4:Hash("SHA256", data, { return_encoding = "HEX" })
+  end)
+  if ok and digest then
+    return tostring(digest)
+  end
+  return nil
 end
 
-local function light_name_from_id(device_id)
-  return "C4 Light " .. tostring(device_id)
+local function device_name_from_id(class, device_id)
+  return class.name_prefix .. " " .. tostring(device_id)
 end
 
-local function build_sync_payload()
-  local devices = {}
+-- Re-serializes one device; returns true when its record actually changed.
+local function refresh_device_fragment(device_id)
+  local class = DEVICE_CLASS_BY_ID[device_id]
+  local fragment = C4:JsonEncode({
+    device_id = tostring(device_id),
+    name = device_name_from_id(class, device_id),
+    room = DEFAULT_ROOM_NAME,
+    type = class.type,
+    capabilities = class.capabilities,
+    state = DEVICE_STATE[device_id] or class.default_state(),
+    throttle = class.type == "sensor" and SENSOR_THROTTLE[device_id] or nil,
+  })
+  if DEVICE_FRAGMENTS[device_id] == fragment then
+    return false
+  end
+  DEVICE_FRAGMENTS[device_id] = fragment
+  devices_json = nil
+  return true
+end
 
-  for _, device_id in ipairs(LIGHT_DEVICE_IDS) do
-    local state = LIGHT_STATE[device_id] or { on = false, brightness = 0 }
-    table.insert(devices, {
-      device_id = tostring(device_id),
-      name = light_name_from_id(device_id),
-      room = DEFAULT_ROOM_NAME,
-      type = "light",
-      capabilities = {"on_off", "brightness"},
-      state = {
-        on = state.on == true,
-        brightness = tonumber(state.brightness) or 0,
-      },
-    })
+-- Full devices array and its hash, reassembled only after a device changed.
+local function full_devices_json()
+  if devices_json == nil then
+    local fragments = {}
+    for _, device_id in ipairs(EXPORTED_DEVICE_IDS) do
+      if DEVICE_FRAGMENTS[device_id] == nil then
+        refresh_device_fragment(device_id)
+      end
+      table.insert(fragments, DEVICE_FRAGMENTS[device_id])
+    end
+    devices_json = "[" .. table.concat(fragments, ",") .. "]"
+    devices_hash = hash_hex(devices_json)
   end
+  return devices_json, devices_hash
+end
 
-  return {
+-- Splices a pre-serialized devices array into the sync envelope.
+local function build_sync_body(devices_array_json, partial)
+  local envelope = {
     protocol_version = 1,
     bridge_id = BRIDGE_ID,
     timestamp = os.date("!%Y-%m-%dT%H:%M:%SZ"),
-    devices = devices,
   }
+  if partial then
+    envelope.partial = true
+  end
+  local prefix = string.match(C4:JsonEncode(envelope), "^(.*)}%s*$")
+  return prefix .. ',"devices":' .. devices_array_json .. "}"
 end
 
-local function post_json(url, body_table, on_done)
-  local body = C4:JsonEncode(body_table)
-  local ticket_id = C4:urlPost(
-    url,
-    body,
-    auth_headers(),
-    false,
-    function(tid, data, response_code, headers, err)
-      if on_done then
-        on_done(tid, data, response_code, headers, err)
-      end
-    end,
-    HTTP_OPTIONS
-  )
+local function start_backoff()
+  local delay = math.min(BACKOFF_MAX_MS, BACKOFF_BASE_MS * 2 ^ (consecutive_failures - 1))
+  delay = math.floor(delay / 2 + math.random() * delay / 2)
+  if backoff_timer then
+    backoff_timer:Cancel()
+  end
+  backoff_timer = C4:SetTimer(delay, function()
+    backoff_timer = nil
+    pump_requests()
+  end, false)
+  debug_log("Backing off " .. tostring(delay) .. "ms after " .. tostring(consecutive_failures) .. " failures")
+end
 
-  debug_log("POST scheduled ticket=" .. tostring(ticket_id) .. " url=" .. tostring(url))
+local function dispatch_request(request)
+  -- Bodies are built at dispatch time so a request that waited in the queue
+  -- still sends the latest state.
+  local url, body, extra_headers = request.build()
+  if url == nil then
+    return
+  end
+
+  requests_in_flight = requests_in_flight + 1
+  local finished = false
+  local watchdog = nil
+  local function finish(tid, data, response_code, headers, err)
+    if finished then
+      return
+    end
+    finished = true
+    if watchdog then
+      watchdog:Cancel()
+    end
+    requests_in_flight = requests_in_flight - 1
+
+    local code = tonumber(response_code) or 0
+    if code >= 200 and code < 300 then
+      consecutive_failures = 0
+    else
+      consecutive_failures = consecutive_failures + 1
+      start_backoff()
+    end
+
+    if request.on_done then
+      request.on_done(tid, data, response_code, headers, err)
+    end
+    pump_requests()
+  end
+
+  watchdog = C4:SetTimer(REQUEST_WATCHDOG_MS, function()
+    watchdog = nil
+    finish(nil, nil, 0, nil, "request timed out")
+  end, false)
+
+  local ticket_id
+  if request.method == "POST" then
+    ticket_id = C4:urlPost(url, body, auth_headers(extra_headers), false, finish, HTTP_OPTIONS)
+  else
+    ticket_id = C4:urlGet(url, auth_headers(extra_headers), false, finish, HTTP_OPTIONS)
+  end
+
+  debug_log(request.method .. " scheduled ticket=" .. tostring(ticket_id) .. " url=" .. tostring(url))
 end
 
-local function get_json(url, on_done)
-  local ticket_id = C4:urlGet(
-    url,
-    auth_headers(),
-    false,
-    function(tid, data, response_code, headers, err)
-      if on_done then
-        on_done(tid, data, response_code, headers, err)
+pump_requests = function()
+  while backoff_timer == nil and requests_in_flight < MAX_REQUESTS_IN_FLIGHT and #request_queue > 0 do
+    dispatch_request(table.remove(request_queue, 1))
+  end
+end
+
+-- Queues a request; a queued request with the same key is replaced so only
+-- the latest sync or poll waits while HA is slow or backing off. Urgent
+-- requests go to the front of the queue.
+local function queue_request(method, key, build, on_done, urgent)
+  local request = { method = method, key = key, build = build, on_done = on_done }
+  if key then
+    for index, queued in ipairs(request_queue) do
+      if queued.key == key then
+        request_queue[index] = request
+        pump_requests()
+        return
       end
-    end,
-    HTTP_OPTIONS
-  )
+    end
+  end
+  if urgent then
+    table.insert(request_queue, 1, request)
+  else
+    table.insert(request_queue, request)
+  end
+  pump_requests()
+end
 
-  debug_log("GET scheduled ticket=" .. tostring(ticket_id) .. " url=" .. tostring(url))
+local function post_json(url, body_table, on_done, extra_headers)
+  queue_request("POST", nil, function()
+    return url, C4:JsonEncode(body_table), extra_headers
+  end, on_done)
+end
+
+local function get_json(url, on_done, key)
+  queue_request("GET", key, function()
+    return url
+  end, on_done)
+end
+
+local function clamp_number(v, lo, hi)
+  if v < lo then return lo end
+  if v > hi then return hi end
+  return math.floor(v)
+end
+
+local function decode_json(data)
+  local ok, decoded = pcall(function()
+    return C4:JsonDecode(data)
+  end)
+  if ok and type(decoded) == "table" then
+    return decoded
+  end
+  return nil
+end
+
+local function apply_pacing(pacing)
+  if type(pacing) ~= "table" then
+    return
+  end
+
+  local next_poll = tonumber(pacing.next_poll_ms)
+  if next_poll then
+    poll_interval_ms = clamp_number(next_poll, MIN_POLL_MS, MAX_POLL_MS)
+  end
+  local next_sync = tonumber(pacing.next_sync_ms)
+  if next_sync then
+    sync_interval_ms = clamp_number(next_sync, MIN_SYNC_MS, MAX_SYNC_MS)
+  end
+  local batch_size = tonumber(pacing.batch_size)
+  if batch_size then
+    command_batch_size = clamp_number(batch_size, 1, MAX_BATCH_SIZE)
+  end
+  if pacing.full_sync == true then
+    full_sync_requested = true
+  end
 end
 
 local function sync_to_ha()
   if SHARED_SECRET == "" then
     C4:UpdateProperty("Bridge Status", "Missing Shared Secret")
     debug_log("Skipping sync: shared secret missing")
+    schedule_sync(sync_interval_ms)
     return
   end
 
-  post_json(HA_BASE_URL .. "/api/control4_bridge/sync", build_sync_payload(), function(_, data, code, _, err)
+  full_sync_requested = false
+  sync_in_flight = true
+  schedule_sync(REQUEST_WATCHDOG_MS)
+
+  queue_request("POST", "sync", function()
+    -- HA skips all processing when the devices hash matches the last snapshot.
+    local devices_array, hash = full_devices_json()
+    local extra_headers = {}
+    if hash then
+      extra_headers["X-C4-Bridge-Id"] = BRIDGE_ID
+      extra_headers["X-C4-Devices-Hash"] = hash
+    end
+    return HA_BASE_URL .. "/api/control4_bridge/sync", build_sync_body(devices_array, false), extra_headers
+  end, function(_, data, code, _, err)
+    sync_in_flight = false
     if code == 200 then
       C4:UpdateProperty("Bridge Status", "Connected")
       debug_log("Sync succeeded")
+      local decoded = decode_json(data)
+      if decoded then
+        apply_pacing(decoded.pacing)
+      end
     else
       C4:UpdateProperty("Bridge Status", "Sync Error " .. tostring(code))
       info_log("Sync failed code=" .. tostring(code) .. " err=" .. tostring(err))
@@ -194,9 +650,93 @@ local function sync_to_ha()
         info_log("Sync response body: " .. tostring(data))
       end
     end
+    schedule_sync(sync_interval_ms)
   end)
 end
 
+-- Pushes only the devices that changed since the last flush. A failed push
+-- is not retried; the next full snapshot carries the same state.
+local function flush_changes()
+  change_timer = nil
+  queue_request("POST", "changes", function()
+    -- Changes that arrive while the push waits in the queue ride along.
+    local fragments = {}
+    for device_id, _ in pairs(pending_changes) do
+      if DEVICE_FRAGMENTS[device_id] then
+        table.insert(fragments, DEVICE_FRAGMENTS[device_id])
+      end
+    end
+    pending_changes = {}
+    if #fragments == 0 or SHARED_SECRET == "" then
+      return nil
+    end
+    debug_log("Pushing " .. tostring(#fragments) .. " changed devices")
+    return HA_BASE_URL .. "/api/control4_bridge/sync", build_sync_body("[" .. table.concat(fragments, ",") .. "]", true)
+  end, function(_, data, code, _, err)
+    if code == 200 then
+      local decoded = decode_json(data)
+      if decoded then
+        apply_pacing(decoded.pacing)
+      end
+    else
+      info_log("Change push failed code=" .. tostring(code) .. " err=" .. tostring(err))
+    end
+  end)
+end
+
+local function mark_device_changed(device_id)
+  if DEVICE_CLASS_BY_ID[device_id] == nil or not refresh_device_fragment(device_id) then
+    return
+  end
+  pending_changes[device_id] = true
+  if change_timer == nil then
+    change_timer = C4:SetTimer(CHANGE_DEBOUNCE_MS, function()
+      flush_changes()
+    end, false)
+  end
+end
+
+-- Button events skip the snapshot path entirely and are sent ahead of queued
+-- syncs and polls. Events that pile up during an outage are sent together,
+-- minus any that are too old to still be meaningful; failures are not retried.
+local function flush_events()
+  queue_request("POST", "events", function()
+    local cutoff = os.time() - EVENT_MAX_AGE_SECONDS
+    local events = {}
+    for _, event in ipairs(pending_events) do
+      if event.queued_at >= cutoff then
+        table.insert(events, { device_id = event.device_id, button = event.button, action = event.action })
+      end
+    end
+    pending_events = {}
+    if #events == 0 or SHARED_SECRET == "" then
+      return nil
+    end
+    return HA_BASE_URL .. "/api/control4_bridge/event", C4:JsonEncode({ bridge_id = BRIDGE_ID, events = events })
+  end, function(_, _, code, _, err)
+    if code ~= 200 then
+      info_log("Button event push failed code=" .. tostring(code) .. " err=" .. tostring(err))
+    end
+  end, true)
+end
+
+local function send_button_event(device_id, button, action)
+  local class = DEVICE_CLASS_BY_ID[device_id]
+  if class == nil or class.type ~= "keypad" or not BUTTON_ACTIONS[action] then
+    debug_log("Ignoring button event device=" .. tostring(device_id) .. " action=" .. tostring(action))
+    return
+  end
+  if #pending_events >= MAX_PENDING_EVENTS then
+    table.remove(pending_events, 1)
+  end
+  table.insert(pending_events, { device_id = device_id, button = button, action = action, queued_at = os.time() })
+  flush_events()
+end
+
+-- Set when C4:SendToDevice raises while a command runs. Such failures are
+-- transient (device busy, proxy restarting), so the ack lets HA retry them.
+local send_raised = false
+
 local function send_to_device(device_id, command, params)
   if C4.SendToDevice == nil then
     return false, "C4:SendToDevice unavailable"
@@ -209,6 +749,7 @@ local function send_to_device(device_id, command, params)
   end)
 
   if not ok then
+    send_raised = true
     return false, tostring(err)
   end
   return true, "sent"
@@ -221,10 +762,19 @@ local function clamp_percent(v)
   return math.floor(n + 0.5)
 end
 
-local function handle_light_command(device_id, action, params)
-  local state = LIGHT_STATE[device_id] or { on = false, brightness = 0 }
-  LIGHT_STATE[device_id] = state
+local function send_first_supported(device_id, tries)
+  local last_err = ""
+  for _, attempt in ipairs(tries) do
+    local ok, err = send_to_device(device_id, attempt.cmd, attempt.args or {})
+    if ok then
+      return true, attempt.cmd
+    end
+    last_err = tostring(err)
+  end
+  return false, last_err
+end
 
+local function handle_light_command(device_id, state, action, params)
   if action == "turn_off" then
     local ok, err = send_to_device(device_id, "OFF", {})
     if ok then
@@ -241,24 +791,13 @@ local function handle_light_command(device_id, action, params)
     end
 
     if brightness ~= nil then
-      local ok_level = false
-      local err_level = ""
-      local tries = {
+      local ok_level, err_level = send_first_supported(device_id, {
         { cmd = "RAMP_TO_LEVEL", args = { LEVEL = tostring(brightness), RATE = "0" } },
         { cmd = "SET_LEVEL", args = { LEVEL = tostring(brightness) } },
-      }
-
-      for _, attempt in ipairs(tries) do
-        local ok, err = send_to_device(device_id, attempt.cmd, attempt.args)
-        if ok then
-          ok_level = true
-          break
-        end
-        err_level = tostring(err)
-      end
+      })
 
       if not ok_level then
-        return false, "brightness command failed: " .. err_level
+        return false, "brightness command failed: " .. tostring(err_level)
       end
 
       state.on = brightness > 0
@@ -279,33 +818,226 @@ local function handle_light_command(device_id, action, params)
   return false, "unsupported action for light"
 end
 
+local function handle_lock_command(device_id, state, action, _)
+  local commands = { lock = "LOCK", unlock = "UNLOCK" }
+  local command = commands[action]
+  if command == nil then
+    return false, "unsupported action for lock"
+  end
+
+  local ok, err = send_to_device(device_id, command, {})
+  if ok then
+    state.lock_status = (action == "lock") and "locked" or "unlocked"
+  end
+  return ok, err
+end
+
+local function handle_cover_command(device_id, state, action, params)
+  if action == "stop" then
+    local ok, err = send_to_device(device_id, "STOP", {})
+    if ok then
+      state.status = "stopped"
+    end
+    return ok, err
+  end
+
+  local target = nil
+  local tries = nil
+  if action == "open" then
+    target = 100
+    tries = {
+      { cmd = "SET_LEVEL_TARGET", args = { LEVEL_TARGET = "100" } },
+      { cmd = "OPEN" },
+    }
+  elseif action == "close" then
+    target = 0
+    tries = {
+      { cmd = "SET_LEVEL_TARGET", args = { LEVEL_TARGET = "0" } },
+      { cmd = "CLOSE" },
+    }
+  elseif action == "set_position" and type(params) == "table" and params.position ~= nil then
+    target = clamp_percent(params.position)
+    tries = {
+      { cmd = "SET_LEVEL_TARGET", args = { LEVEL_TARGET = tostring(target) } },
+    }
+  else
+    return false, "unsupported action for cover"
+  end
+
+  local ok, err = send_first_supported(device_id, tries)
+  if not ok then
+    return false, "cover command failed: " .. tostring(err)
+  end
+
+  state.position = target
+  state.status = (target == 0) and "closed" or "open"
+  return true, "cover moved"
+end
+
+local function handle_thermostat_command(device_id, state, action, params)
+  if type(params) ~= "table" then
+    params = {}
+  end
+
+  if action == "set_hvac_mode" and params.mode ~= nil then
+    local ok, err = send_to_device(device_id, "SET_MODE_HVAC", { MODE = tostring(params.mode) })
+    if ok then
+      state.hvac_mode = tostring(params.mode)
+    end
+    return ok, err
+  end
+
+  if action == "set_fan_mode" and params.mode ~= nil then
+    local ok, err = send_to_device(device_id, "SET_MODE_FAN", { MODE = tostring(params.mode) })
+    if ok then
+      state.fan_mode = tostring(params.mode)
+    end
+    return ok, err
+  end
+
+  if action == "set_setpoints" then
+    local scale_key = (tostring(params.scale or state.scale or "F") == "C") and "CELSIUS" or "FAHRENHEIT"
+    local setpoints = {
+      { key = "heat_setpoint", cmd = "SET_SETPOINT_HEAT" },
+      { key = "cool_setpoint", cmd = "SET_SETPOINT_COOL" },
+    }
+    for _, setpoint in ipairs(setpoints) do
+      local value = tonumber(params[setpoint.key])
+      if value ~= nil then
+        local ok, err = send_to_device(device_id, setpoint.cmd, { [scale_key] = tostring(value) })
+        if not ok then
+          return false, "setpoint command failed: " .. tostring(err)
+        end
+        state[setpoint.key] = value
+      end
+    end
+    return true, "setpoints set"
+  end
+
+  return false, "unsupported action for thermostat"
+end
+
+local COMMAND_HANDLERS = {
+  light = handle_light_command,
+  lock = handle_lock_command,
+  cover = handle_cover_command,
+  thermostat = handle_thermostat_command,
+}
+
+-- Re-reads the devices' proxy variables and pushes them as one partial sync
+-- right away, even if nothing changed, so HA gets confirmed current state.
+local function refresh_devices(device_ids)
+  local count = 0
+  for _, raw_id in ipairs(device_ids) do
+    local device_id = tostring(raw_id)
+    if DEVICE_CLASS_BY_ID[device_id] ~= nil then
+      read_device_variables(device_id)
+      refresh_device_fragment(device_id)
+      pending_changes[device_id] = true
+      count = count + 1
+    end
+  end
+  if count == 0 then
+    return false, "no exported devices to refresh"
+  end
+  if change_timer then
+    change_timer:Cancel()
+  end
+  flush_changes()
+  return true, "Refreshing " .. tostring(count) .. " devices"
+end
+
+-- Fixed-size ring of executed IDs; the oldest ID is forgotten once full.
+local function remember_executed(command_id, ack)
+  local evicted = executed_ring[executed_next]
+  if evicted ~= nil then
+    executed_commands[evicted] = nil
+  end
+  executed_ring[executed_next] = command_id
+  executed_commands[command_id] = ack
+  executed_next = (executed_next % EXECUTED_COMMAND_HISTORY) + 1
+end
+
 local function execute_command(command)
   local action = tostring(command.action or "")
   local command_id = tostring(command.command_id or "")
   local device_id = tostring(command.device_id or "")
   local params = command.params
 
+  -- Redelivery means HA never saw the ack; repeat it instead of the command.
+  local previous = executed_commands[command_id]
+  if previous ~= nil then
+    debug_log("Skipping duplicate command_id=" .. command_id)
+    return previous
+  end
+
   debug_log("Execute command_id=" .. command_id .. " device_id=" .. device_id .. " action=" .. action)
 
   local ok = false
   local message = "unsupported device"
-
-  if LIGHT_STATE[device_id] ~= nil then
-    ok, message = handle_light_command(device_id, action, params)
+  send_raised = false
+
+  local class = DEVICE_CLASS_BY_ID[device_id]
+  local handler = class and COMMAND_HANDLERS[class.type]
+  if action == "refresh" then
+    ok, message = refresh_devices(type(params) == "table" and type(params.device_ids) == "table" and params.device_ids or {})
+  elseif handler ~= nil then
+    local state = DEVICE_STATE[device_id] or class.default_state()
+    DEVICE_STATE[device_id] = state
+    ok, message = handler(device_id, state, action, params)
+    mark_device_changed(device_id)
   end
 
-  table.insert(command_ack_buffer, {
+  local ack = {
     command_id = command_id,
     status = ok and "success" or "error",
     message = tostring(message),
-  })
+  }
+  -- A retryable failure is not remembered, so HA's retry runs it again.
+  if not ok and send_raised then
+    ack.retryable = true
+  elseif command_id ~= "" then
+    remember_executed(command_id, ack)
+  end
+  return ack
 end
 
+local function buffer_ack(ack)
+  for _, buffered in ipairs(command_ack_buffer) do
+    if buffered == ack then
+      return
+    end
+  end
+  table.insert(command_ack_buffer, ack)
+end
+
+local function remove_sent_acks(sent)
+  local remaining = {}
+  for _, ack in ipairs(command_ack_buffer) do
+    if not sent[ack] then
+      table.insert(remaining, ack)
+    end
+  end
+  command_ack_buffer = remaining
+end
+
+-- Success acks wait for the next poll; only a batch containing a failure is
+-- posted right away, carrying everything buffered so far.
 local function send_ack_batch()
-  if #command_ack_buffer == 0 then
+  local has_error = false
+  for _, ack in ipairs(command_ack_buffer) do
+    if ack.status ~= "success" then
+      has_error = true
+    end
+  end
+  if not has_error then
     return
   end
 
+  local sent = {}
+  for _, ack in ipairs(command_ack_buffer) do
+    sent[ack] = true
+  end
   local payload = {
     bridge_id = BRIDGE_ID,
     acks = command_ack_buffer,
@@ -313,7 +1045,7 @@ local function send_ack_batch()
 
   post_json(HA_BASE_URL .. "/api/control4_bridge/ack", payload, function(_, _, code, _, err)
     if code == 200 then
-      command_ack_buffer = {}
+      remove_sent_acks(sent)
       debug_log("Command ack succeeded")
     else
       info_log("Ack failed code=" .. tostring(code) .. " err=" .. tostring(err))
@@ -323,58 +1055,137 @@ end
 
 local function poll_commands()
   if SHARED_SECRET == "" then
+    schedule_poll(poll_interval_ms)
     return
   end
 
-  local url = HA_BASE_URL .. "/api/control4_bridge/commands?bridge_id=" .. BRIDGE_ID .. "&limit=25"
+  schedule_poll(REQUEST_WATCHDOG_MS)
+  local url = HA_BASE_URL .. "/api/control4_bridge/commands?bridge_id=" .. BRIDGE_ID .. "&limit=" .. tostring(command_batch_size)
+
+  local sent = {}
+  local ack_ids = {}
+  for _, ack in ipairs(command_ack_buffer) do
+    if ack.status == "success" and #ack_ids < MAX_PIGGYBACK_ACKS then
+      sent[ack] = true
+      table.insert(ack_ids, ack.command_id)
+    end
+  end
+  if #ack_ids > 0 then
+    url = url .. "&ack=" .. table.concat(ack_ids, ",")
+  end
+
   get_json(url, function(_, data, code, _, err)
     if code ~= 200 then
       debug_log("Command poll failed code=" .. tostring(code) .. " err=" .. tostring(err))
       if data and tostring(data) ~= "" then
         debug_log("Command poll response body: " .. tostring(data))
       end
+      schedule_poll(poll_interval_ms)
       return
     end
 
-    local ok, decoded = pcall(function()
-      return C4:JsonDecode(data)
-    end)
-
-    if not ok or type(decoded) ~= "table" then
+    remove_sent_acks(sent)
+    local decoded = decode_json(data)
+    if decoded == nil then
       info_log("Failed to decode command payload")
+      schedule_poll(poll_interval_ms)
       return
     end
 
+    apply_pacing(decoded.pacing)
+    schedule_poll(poll_interval_ms)
+
     local commands = decoded.commands or {}
-    if type(commands) ~= "table" then
-      return
+    if type(commands) == "table" then
+      for _, cmd in ipairs(commands) do
+        buffer_ack(execute_command(cmd))
+      end
+      send_ack_batch()
     end
 
-    for _, cmd in ipairs(commands) do
-      execute_command(cmd)
+    if full_sync_requested and not sync_in_flight then
+      sync_to_ha()
     end
+  end, "poll")
+end
 
-    send_ack_batch()
-  end)
+-- Optional push listener: HA POSTs commands to /commands on this port and
+-- gets the acks back in the response. Polling keeps running as the fallback.
+local function start_push_listener()
+  if push_listener_port == push_port or C4.CreateServer == nil then
+    return
+  end
+  if push_listener_port > 0 then
+    pcall(function() C4:DestroyServer() end)
+    push_listener_port = 0
+    push_buffers = {}
+  end
+  if push_port > 0 then
+    local ok, err = pcall(function() C4:CreateServer(push_port, "", true) end)
+    if ok then
+      push_listener_port = push_port
+      info_log("Command push listener on port " .. tostring(push_port))
+    else
+      info_log("Command push listener failed: " .. tostring(err))
+    end
+  end
 end
 
-local function schedule_timers()
-  if sync_timer then
-    sync_timer:Cancel()
+local HTTP_REASONS = { [200] = "OK", [400] = "Bad Request", [401] = "Unauthorized", [404] = "Not Found" }
+
+local function handle_push_request(method, path, headers, body)
+  if method ~= "POST" or path ~= "/commands" then
+    return 404, { ok = false, error = "not_found" }
   end
+  if SHARED_SECRET == "" or headers["x-c4-bridge-secret"] ~= SHARED_SECRET then
+    return 401, { ok = false, error = "unauthorized" }
+  end
+  local decoded = decode_json(body)
+  if decoded == nil or decoded.bridge_id ~= BRIDGE_ID or type(decoded.commands) ~= "table" then
+    return 400, { ok = false, error = "invalid_request" }
+  end
+
+  local acks = {}
+  for _, cmd in ipairs(decoded.commands) do
+    table.insert(acks, execute_command(cmd))
+  end
+  return 200, { ok = true, acks = acks }
+end
+
+local function send_http_response(handle, code, body_table)
+  local body = C4:JsonEncode(body_table)
+  C4:ServerSend(handle, "HTTP/1.1 " .. tostring(code) .. " " .. HTTP_REASONS[code] .. "\r\n"
+    .. "Content-Type: application/json\r\n"
+    .. "Content-Length: " .. tostring(#body) .. "\r\n\r\n" .. body)
+end
+
+-- Polls and syncs run as self-rescheduling one-shot timers so every response
+-- can move the next run earlier or later.
+schedule_poll = function(delay_ms)
   if poll_timer then
     poll_timer:Cancel()
   end
+  poll_timer = C4:SetTimer(delay_ms, function()
+    poll_timer = nil
+    poll_commands()
+  end, false)
+end
 
-  sync_timer = C4:SetTimer(SYNC_INTERVAL_SECONDS * 1000, function()
+schedule_sync = function(delay_ms)
+  if sync_timer then
+    sync_timer:Cancel()
+  end
+  sync_timer = C4:SetTimer(delay_ms, function()
+    sync_timer = nil
     sync_to_ha()
-  end, true)
+  end, false)
+end
 
-  poll_timer = C4:SetTimer(POLL_INTERVAL_SECONDS * 1000, function()
-    poll_commands()
-  end, true)
+local function schedule_timers()
+  schedule_sync(sync_interval_ms)
+  schedule_poll(poll_interval_ms)
 
-  debug_log("Timers started sync=" .. tostring(SYNC_INTERVAL_SECONDS) .. "s poll=" .. tostring(POLL_INTERVAL_SECONDS) .. "s")
+  debug_log("Timers started sync=" .. tostring(sync_interval_ms) .. "ms poll=" .. tostring(poll_interval_ms) .. "ms")
 end
 
 local function force_sync_command()
@@ -386,7 +1197,10 @@ local function force_poll_command()
 end
 
 function OnDriverLateInit()
+  math.randomseed(os.time())
   load_properties()
+  watch_device_variables()
+  start_push_listener()
   update_runtime_properties()
   schedule_timers()
   info_log("Driver initialized")
@@ -394,18 +1208,92 @@ end
 
 function OnPropertyChanged(name)
   load_properties()
+  watch_device_variables()
+  start_push_listener()
   debug_log("Property changed: " .. tostring(name))
 
-  if name == "Bridge ID" or name == "Shared Secret" or name == "Home Assistant Base URL" or name == "Light Device IDs" or name == "Light Devices" or name == "Default Room Name" then
+  local sync_properties = {
+    ["Bridge ID"] = true,
+    ["Shared Secret"] = true,
+    ["Home Assistant Base URL"] = true,
+    ["Default Room Name"] = true,
+    ["Command Push Port"] = true,
+    ["Sensor Throttle"] = true,
+  }
+  for _, class in ipairs(DEVICE_CLASSES) do
+    if class.selector_property then
+      sync_properties[class.selector_property] = true
+    end
+    if class.id_list_property then
+      sync_properties[class.id_list_property] = true
+    end
+  end
+
+  if sync_properties[name] then
     sync_to_ha()
   end
 end
 
+function OnWatchedVariableChanged(idDevice, idVariable, strValue)
+  local device_id = tostring(idDevice)
+  local class = DEVICE_CLASS_BY_ID[device_id]
+  local update = DEVICE_VARIABLES[device_id] and DEVICE_VARIABLES[device_id][tonumber(idVariable)]
+  if update == nil then
+    return
+  end
+
+  local state = DEVICE_STATE[device_id] or class.default_state()
+  DEVICE_STATE[device_id] = state
+  update(state, strValue)
+  mark_device_changed(device_id)
+end
+
+-- Requests may arrive split across reads and several may share a keep-alive
+-- connection, so data is buffered per client until a full request is in.
+function OnServerDataIn(nHandle, strData, strclientAddress, strPort)
+  local buffer = (push_buffers[nHandle] or "") .. tostring(strData)
+  if #buffer > MAX_PUSH_REQUEST_BYTES then
+    push_buffers[nHandle] = nil
+    C4:ServerCloseClient(nHandle)
+    return
+  end
+
+  while true do
+    local header_end = string.find(buffer, "\r\n\r\n", 1, true)
+    if header_end == nil then
+      break
+    end
+    local head = string.sub(buffer, 1, header_end - 1)
+    local headers = {}
+    for name, value in string.gmatch(head, "\r\n([^:\r\n]+):%s*([^\r\n]*)") do
+      headers[string.lower(name)] = value
+    end
+    local body_end = header_end + 3 + (tonumber(headers["content-length"]) or 0)
+    if #buffer < body_end then
+      break
+    end
+    local method, path = string.match(head, "^(%u+)%s+(%S+)")
+    local body = string.sub(buffer, header_end + 4, body_end)
+    buffer = string.sub(buffer, body_end + 1)
+    send_http_response(nHandle, handle_push_request(method, path, headers, body))
+  end
+  push_buffers[nHandle] = buffer
+end
+
+function OnServerConnectionStatusChanged(nHandle, nPort, strStatus)
+  if strStatus == "OFFLINE" then
+    push_buffers[nHandle] = nil
+  end
+end
+
 function ExecuteCommand(strCommand, tParams)
   if strCommand == "ForceSync" then
     force_sync_command()
   elseif strCommand == "ForcePoll" then
     force_poll_command()
+  elseif strCommand == "SendButtonEvent" then
+    tParams = tParams or {}
+    send_button_event(tostring(tParams["Keypad"] or ""), tostring(tParams["Button"] or ""), string.lower(tostring(tParams["Action"] or "")))
   end
 end
 
@@ -2,36 +2,65 @@
 
 from __future__ import annotations
 
+from collections.abc import Awaitable, Callable
+from functools import partial
 from http import HTTPStatus
 from typing import Any
 
+from aiohttp import web
+
 from homeassistant.components.http import HomeAssistantView
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers import device_registry as dr
 from homeassistant.helpers.dispatcher import async_dispatcher_send
 
 from .const import (
     API_ACK_PATH,
     API_COMMANDS_PATH,
+    API_EVENT_PATH,
     API_SYNC_PATH,
-    ATTR_PROTOCOL_VERSION,
     DOMAIN,
-    PROTO_VERSION,
+    HEADER_PUSH_PORT,
+    HEADER_SECRET,
+    SIGNAL_DEVICE_EVENT,
     SIGNAL_DEVICE_UPDATE,
+    SIGNAL_DEVICES_REMOVED,
+    SIGNAL_NEW_DEVICES,
 )
+from .entity import async_load_platforms
+from .metrics import StageTimer
+from .models import SyncResult
+from .protocol import async_handle_sync, handle_ack, handle_commands, handle_events
 from .store import BridgeStore
 
 
-def _normalize_maybe_array(value: Any) -> list[Any] | None:
-    """Normalize list-like payloads that may arrive as dicts with numeric keys."""
-    if isinstance(value, list):
-        return value
-    if isinstance(value, dict):
-        normalized: list[Any] = []
-        for key in sorted(value.keys(), key=lambda k: int(k) if str(k).isdigit() else str(k)):
-            normalized.append(value[key])
-        return normalized
-    return None
+@callback
+def _async_publish_result(hass: HomeAssistant, store: BridgeStore, result: SyncResult) -> None:
+    """Mirror a store update into the device registry and notify platforms."""
+    device_registry = dr.async_get(hass)
+    for device_id in result.removed:
+        registry_device = device_registry.async_get_device(identifiers={(DOMAIN, f"{store.bridge_id}:{device_id}")})
+        if registry_device is not None:
+            device_registry.async_remove_device(registry_device.id)
+
+    for device_id in result.changed:
+        device = store.devices[device_id]
+        device_registry.async_get_or_create(
+            config_entry_id=hass.data[DOMAIN]["entry_id"],
+            identifiers={(DOMAIN, f"{store.bridge_id}:{device.device_id}")},
+            manufacturer="Control4",
+            model="Bridge Device",
+            name=device.name,
+            suggested_area=device.room or None,
+        )
+
+    if result.removed:
+        async_dispatcher_send(hass, SIGNAL_DEVICES_REMOVED, result.removed)
+    async_load_platforms(hass, result.added)
+    for platform, device_ids in result.added.items():
+        async_dispatcher_send(hass, SIGNAL_NEW_DEVICES.format(platform), device_ids)
+    if result.changed:
+        async_dispatcher_send(hass, SIGNAL_DEVICE_UPDATE, result.changed)
 
 
 class _BridgeBaseView(HomeAssistantView):
@@ -53,9 +82,32 @@ class _BridgeBaseView(HomeAssistantView):
         if not domain_data:
             return False
         expected = domain_data.get("shared_secret", "")
-        provided = headers.get("X-C4-Bridge-Secret", "")
+        provided = headers.get(HEADER_SECRET, "")
         return bool(provided) and provided == expected
 
+    async def _run(
+        self,
+        request: web.Request,
+        kind: str,
+        handler: Callable[[web.Request, StageTimer], Awaitable[web.Response]],
+    ) -> web.Response:
+        """Run a handler with stage timing, liveness and, when enabled, traffic capture."""
+        timer = StageTimer()
+        response = await handler(request, timer)
+        timer.mark("respond")
+        hass = request.app["hass"]
+        domain_data = self._domain_data(hass)
+        if domain_data:
+            store: BridgeStore = domain_data["store"]
+            if response.status < 400 and store.mark_contact():
+                # The driver is back: one dispatch brings every entity back.
+                async_dispatcher_send(hass, SIGNAL_DEVICE_UPDATE, set(store.devices))
+            domain_data["metrics"].record(kind, timer, request.content_length or 0)
+            if (capture := domain_data.get("capture")) is not None:
+                body = await request.read() if request.body_exists else b""
+                capture.async_record(kind, request, body, response.status, timer.started, timer.total)
+        return response
+
 
 class Control4SyncView(_BridgeBaseView):
     """Accepts state syncs from the Control4 driver."""
@@ -64,41 +116,28 @@ class Control4SyncView(_BridgeBaseView):
     name = "api:control4_bridge:sync"
 
     async def post(self, request):
+        return await self._run(request, "sync", self._handle)
+
+    async def _handle(self, request, timer: StageTimer):
         hass = request.app["hass"]
         if not self._domain_data(hass):
             return self.json({"ok": False, "error": "integration_not_ready"}, status_code=HTTPStatus.SERVICE_UNAVAILABLE)
         if not self._is_authorized(hass, request.headers):
             return self.json({"ok": False, "error": "unauthorized"}, status_code=HTTPStatus.UNAUTHORIZED)
 
-        body: dict[str, Any] = await request.json()
+        domain_data = self._domain_data(hass)
         store = self._get_store(hass)
-
-        if body.get("bridge_id") != store.bridge_id:
-            return self.json({"ok": False, "error": "unknown_bridge"}, status_code=HTTPStatus.NOT_FOUND)
-
-        if body.get(ATTR_PROTOCOL_VERSION) != PROTO_VERSION:
-            return self.json({"ok": False, "error": "unsupported_protocol"}, status_code=HTTPStatus.BAD_REQUEST)
-
-        devices = _normalize_maybe_array(body.get("devices", []))
-        if devices is None:
-            return self.json({"ok": False, "error": "invalid_devices"}, status_code=HTTPStatus.BAD_REQUEST)
-
-        accepted = store.upsert_devices(devices)
-
-        # Keep HA device registry in sync for discovery clarity.
-        device_registry = dr.async_get(hass)
-        for device in store.devices.values():
-            device_registry.async_get_or_create(
-                config_entry_id=hass.data[DOMAIN]["entry_id"],
-                identifiers={(DOMAIN, f"{store.bridge_id}:{device.device_id}")},
-                manufacturer="Control4",
-                model="Bridge Device",
-                name=device.name,
-                suggested_area=device.room or None,
-            )
-
-        async_dispatcher_send(hass, SIGNAL_DEVICE_UPDATE)
-        return self.json({"ok": True, "accepted_devices": accepted})
+        domain_data["push"].async_set_endpoint(request.remote, request.headers.get(HEADER_PUSH_PORT))
+        payload, status = await async_handle_sync(
+            store,
+            request.headers,
+            request.json,
+            domain_data["sync_lock"],
+            domain_data["sync_chunk_size"],
+            partial(_async_publish_result, hass, store),
+            timer,
+        )
+        return self.json(payload, status_code=status)
 
 
 class Control4CommandsView(_BridgeBaseView):
@@ -108,39 +147,17 @@ class Control4CommandsView(_BridgeBaseView):
     name = "api:control4_bridge:commands"
 
     async def get(self, request):
+        return await self._run(request, "commands", self._handle)
+
+    async def _handle(self, request, timer: StageTimer):
         hass = request.app["hass"]
         if not self._domain_data(hass):
             return self.json({"ok": False, "error": "integration_not_ready"}, status_code=HTTPStatus.SERVICE_UNAVAILABLE)
         if not self._is_authorized(hass, request.headers):
             return self.json({"ok": False, "error": "unauthorized"}, status_code=HTTPStatus.UNAUTHORIZED)
 
-        store = self._get_store(hass)
-        bridge_id = request.query.get("bridge_id", "")
-        if bridge_id != store.bridge_id:
-            return self.json({"ok": False, "error": "unknown_bridge"}, status_code=HTTPStatus.NOT_FOUND)
-
-        try:
-            limit = max(1, min(100, int(request.query.get("limit", 25))))
-        except ValueError:
-            limit = 25
-
-        commands = store.pop_commands(limit)
-
-        return self.json(
-            {
-                "ok": True,
-                "commands": [
-                    {
-                        "command_id": cmd.command_id,
-                        "device_id": cmd.device_id,
-                        "action": cmd.action,
-                        "params": cmd.params,
-                        "created_at": cmd.created_at,
-                    }
-                    for cmd in commands
-                ],
-            }
-        )
+        payload, status = handle_commands(self._get_store(hass), request.query, timer)
+        return self.json(payload, status_code=status)
 
 
 class Control4AckView(_BridgeBaseView):
@@ -150,28 +167,48 @@ class Control4AckView(_BridgeBaseView):
     name = "api:control4_bridge:ack"
 
     async def post(self, request):
+        return await self._run(request, "ack", self._handle)
+
+    async def _handle(self, request, timer: StageTimer):
         hass = request.app["hass"]
         if not self._domain_data(hass):
             return self.json({"ok": False, "error": "integration_not_ready"}, status_code=HTTPStatus.SERVICE_UNAVAILABLE)
         if not self._is_authorized(hass, request.headers):
             return self.json({"ok": False, "error": "unauthorized"}, status_code=HTTPStatus.UNAUTHORIZED)
 
+        timer.mark("auth")
         body: dict[str, Any] = await request.json()
-        store = self._get_store(hass)
+        timer.mark("decode")
+        payload, status = handle_ack(self._get_store(hass), body, timer)
+        return self.json(payload, status_code=status)
+
+
+class Control4EventView(_BridgeBaseView):
+    """Accepts keypad button events and fires them on the matching entities."""
+
+    url = API_EVENT_PATH
+    name = "api:control4_bridge:event"
+
+    async def post(self, request):
+        return await self._run(request, "event", self._handle)
+
+    async def _handle(self, request, timer: StageTimer):
+        hass = request.app["hass"]
+        if not self._domain_data(hass):
+            return self.json({"ok": False, "error": "integration_not_ready"}, status_code=HTTPStatus.SERVICE_UNAVAILABLE)
+        if not self._is_authorized(hass, request.headers):
+            return self.json({"ok": False, "error": "unauthorized"}, status_code=HTTPStatus.UNAUTHORIZED)
+
+        timer.mark("auth")
+        body: dict[str, Any] = await request.json()
+        timer.mark("decode")
 
-        if body.get("bridge_id") != store.bridge_id:
-            return self.json({"ok": False, "error": "unknown_bridge"}, status_code=HTTPStatus.NOT_FOUND)
+        @callback
+        def dispatch(device_id: str, button: str, action: str) -> None:
+            async_dispatcher_send(hass, SIGNAL_DEVICE_EVENT.format(device_id), button, action)
 
-        acks = body.get("acks", [])
-        if not isinstance(acks, list):
-            return self.json({"ok": False, "error": "invalid_acks"}, status_code=HTTPStatus.BAD_REQUEST)
-        command_ids = [
-            str(ack.get("command_id", "")).strip()
-            for ack in acks
-            if isinstance(ack, dict) and ack.get("command_id")
-        ]
-        acked = store.ack_commands(command_ids)
-        return self.json({"ok": True, "acked": acked})
+        payload, status = handle_events(self._get_store(hass), body, dispatch, timer)
+        return self.json(payload, status_code=status)
 
 
 def async_register_views(hass: HomeAssistant) -> None:
@@ -180,3 +217,4 @@ def async_register_views(hass: HomeAssistant) -> None:
     hass.http.register_view(Control4SyncView())
     hass.http.register_view(Control4CommandsView())
     hass.http.register_view(Control4AckView())
+    hass.http.register_view(Control4EventView())
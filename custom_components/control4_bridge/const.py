@@ -3,19 +3,167 @@
 from homeassistant.const import Platform
 
 DOMAIN = "control4_bridge"
-PLATFORMS = [Platform.LIGHT, Platform.SWITCH, Platform.BINARY_SENSOR]
+DATA_VIEWS_REGISTERED = f"{DOMAIN}_views_registered"
+PLATFORMS = [
+    Platform.LIGHT,
+    Platform.SWITCH,
+    Platform.BINARY_SENSOR,
+    Platform.LOCK,
+    Platform.COVER,
+    Platform.CLIMATE,
+    Platform.SENSOR,
+    Platform.EVENT,
+]
 
 CONF_BRIDGE_ID = "bridge_id"
 CONF_SHARED_SECRET = "shared_secret"
+CONF_COMMAND_BATCH_SIZE = "command_batch_size"
+CONF_ORPHAN_SNAPSHOTS = "orphan_snapshots"
+CONF_SYNC_CHUNK_SIZE = "sync_chunk_size"
+CONF_CAPTURE_TRAFFIC = "capture_traffic"
+CONF_SLOW_REQUEST_MS = "slow_request_ms"
+CONF_STALE_AFTER = "stale_after"
+CONF_COMMAND_RATE = "command_rate"
+CONF_COMMAND_BURST = "command_burst"
+# Option key prefix for per-action command TTLs, e.g. "command_ttl_unlock".
+CONF_COMMAND_TTL_PREFIX = "command_ttl_"
 
 DEFAULT_NAME = "Control4 Bridge"
 DEFAULT_BRIDGE_ID = "main_house"
+DEFAULT_COMMAND_BATCH_SIZE = 25
+# Per-device token bucket: sustained commands per second and burst size. A
+# rate of 0 disables limiting.
+DEFAULT_COMMAND_RATE = 5.0
+DEFAULT_COMMAND_BURST = 10
+# Full snapshots a device may be missing from before it is removed. The first
+# miss marks it unavailable.
+DEFAULT_ORPHAN_SNAPSHOTS = 3
+# Devices applied (and entities added) per event-loop slice during a sync.
+DEFAULT_SYNC_CHUNK_SIZE = 200
+DEFAULT_CAPTURE_TRAFFIC = False
+# Seconds without any sync, poll, ack or event before the bridge is stale and
+# all of its entities show unavailable. The driver polls at least once a minute.
+DEFAULT_STALE_AFTER = 180
+LIVENESS_CHECK_SECONDS = 10
+# Bridge requests slower than this are logged with their stage breakdown.
+DEFAULT_SLOW_REQUEST_MS = 500
+# Recent requests per view kept for the percentile summary in diagnostics.
+METRICS_WINDOW = 500
+
+# Seconds a queued command stays valid per action; 0 never expires. Commands
+# still queued after their TTL (e.g. while the controller was offline) are
+# dropped instead of replaying stale intent. Unlisted actions never expire.
+COMMAND_TTL_DEFAULTS: dict[str, int] = {
+    "turn_on": 60,
+    "turn_off": 60,
+    "lock": 30,
+    "unlock": 30,
+    "open": 60,
+    "close": 60,
+    "stop": 10,
+    "set_position": 60,
+    "set_hvac_mode": 300,
+    "set_fan_mode": 300,
+    "set_setpoints": 300,
+    "refresh": 30,
+}
+
+# Actions that drive the same piece of device state. A throttled command only
+# merges into a pending command of its own group (the latest intent wins);
+# unlisted actions form a group of their own, so e.g. a throttled
+# set_setpoints never replaces a pending set_hvac_mode.
+COMMAND_INTENT_GROUPS: dict[str, str] = {
+    "turn_on": "power",
+    "turn_off": "power",
+    "lock": "lock",
+    "unlock": "lock",
+    "open": "position",
+    "close": "position",
+    "stop": "position",
+    "set_position": "position",
+}
+
+# Traffic capture (for tools/replay_capture.py), written to the config dir.
+CAPTURE_FILENAME = f"{DOMAIN}_capture.jsonl"
+CAPTURE_MAX_BYTES = 50 * 1024 * 1024
+CAPTURE_FLUSH_SECONDS = 2
+
+# Pacing hints returned to the driver. Polls speed up while commands are
+# queued or were recently issued and back off once the house goes quiet.
+PACING_BURST_POLL_MS = 250
+PACING_ACTIVE_POLL_MS = 500
+PACING_DEFAULT_POLL_MS = 2000
+PACING_IDLE_POLL_MS = 10000
+PACING_ACTIVE_WINDOW_SECONDS = 60
+PACING_IDLE_AFTER_SECONDS = 900
+PACING_SYNC_MS = 15000
+# While commands are pushed to the driver, polling is only a fallback.
+PACING_PUSH_POLL_MS = 30000
+PACING_IDLE_SYNC_MS = 60000
+MAX_COMMAND_BATCH_SIZE = 100
+# Commands handed to the driver but not acked within this time are redelivered
+# (the driver de-duplicates) up to MAX_COMMAND_ATTEMPTS sends, then dropped.
+INFLIGHT_TIMEOUT_SECONDS = 60
+MAX_COMMAND_ATTEMPTS = 3
 
 API_SYNC_PATH = "/api/control4_bridge/sync"
 API_COMMANDS_PATH = "/api/control4_bridge/commands"
 API_ACK_PATH = "/api/control4_bridge/ack"
+API_EVENT_PATH = "/api/control4_bridge/event"
+# Path on the driver's own listener when it announces a push port.
+DRIVER_PUSH_PATH = "/commands"
+PUSH_TIMEOUT_SECONDS = 5
+# After a failed push, commands go back to polling for this long.
+PUSH_RETRY_SECONDS = 30
+
+HEADER_SECRET = "X-C4-Bridge-Secret"
+HEADER_BRIDGE_ID = "X-C4-Bridge-Id"
+HEADER_DEVICES_HASH = "X-C4-Devices-Hash"
+HEADER_PUSH_PORT = "X-C4-Push-Port"
 
 SIGNAL_DEVICE_UPDATE = "control4_bridge_device_update"
+SIGNAL_NEW_DEVICES = "control4_bridge_new_devices_{}"
+SIGNAL_DEVICES_REMOVED = "control4_bridge_devices_removed"
+# Per-device signal for keypad button events; bypasses the store entirely.
+SIGNAL_DEVICE_EVENT = "control4_bridge_device_event_{}"
+
+# Bridge record type -> HA platform that owns it.
+DEVICE_TYPE_PLATFORMS: dict[str, Platform] = {
+    "light": Platform.LIGHT,
+    "switch": Platform.SWITCH,
+    "relay": Platform.SWITCH,
+    "binary_sensor": Platform.BINARY_SENSOR,
+    "motion": Platform.BINARY_SENSOR,
+    "contact": Platform.BINARY_SENSOR,
+    "lock": Platform.LOCK,
+    "cover": Platform.COVER,
+    "blind": Platform.COVER,
+    "shade": Platform.COVER,
+    "garage_door": Platform.COVER,
+    "gate": Platform.COVER,
+    "thermostat": Platform.CLIMATE,
+    "sensor": Platform.SENSOR,
+    "keypad": Platform.EVENT,
+}
+
+KEYPAD_EVENT_TYPES = ["press", "release", "hold"]
+
+# Sensor field -> (deadband, minimum update interval in seconds). A reading is
+# published immediately when it moves by at least the deadband, otherwise at
+# most once per interval. A deadband of 0 disables throttling for the field.
+SENSOR_THROTTLE_DEFAULTS: dict[str, tuple[float, float]] = {
+    "temperature": (0.5, 60.0),
+    "humidity": (1.0, 60.0),
+    "power": (5.0, 30.0),
+    "energy": (0.01, 60.0),
+    "illuminance": (10.0, 30.0),
+    "voltage": (1.0, 60.0),
+    "current": (0.1, 30.0),
+}
+DEFAULT_SENSOR_THROTTLE = (0.0, 0.0)
+
+SERVICE_REFRESH = "refresh"
+ATTR_DEVICE_IDS = "device_ids"
 
 ATTR_PROTOCOL_VERSION = "protocol_version"
 ATTR_TIMESTAMP = "timestamp"
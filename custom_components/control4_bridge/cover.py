@@ -0,0 +1,79 @@
+"""Cover platform for Control4 Bridge."""
+
+from __future__ import annotations
+
+from homeassistant.components.cover import ATTR_POSITION, CoverDeviceClass, CoverEntity, CoverEntityFeature
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import Platform
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+
+from .entity import Control4BridgeEntity, as_float, async_setup_platform_entities
+
+COVER_DEVICE_CLASSES: dict[str, CoverDeviceClass | None] = {
+    "cover": None,
+    "blind": CoverDeviceClass.BLIND,
+    "shade": CoverDeviceClass.SHADE,
+    "garage_door": CoverDeviceClass.GARAGE,
+    "gate": CoverDeviceClass.GATE,
+}
+
+COVER_FEATURE_MAP: dict[str, CoverEntityFeature] = {
+    "open_close": CoverEntityFeature.OPEN | CoverEntityFeature.CLOSE,
+    "stop": CoverEntityFeature.STOP,
+    "position": CoverEntityFeature.SET_POSITION,
+}
+
+# Control4 cover status -> (is_closed, is_opening, is_closing); None defers to position.
+COVER_STATE_MAP: dict[str, tuple[bool | None, bool, bool]] = {
+    "open": (False, False, False),
+    "closed": (True, False, False),
+    "opening": (False, True, False),
+    "closing": (False, False, True),
+    "stopped": (None, False, False),
+}
+COVER_STATE_UNKNOWN: tuple[bool | None, bool, bool] = (None, False, False)
+
+
+class Control4BridgeCover(Control4BridgeEntity, CoverEntity):
+    """Bridge-backed cover, blind, garage door or gate."""
+
+    def _update_from_device(self) -> None:
+        device = self._device
+        self._attr_device_class = COVER_DEVICE_CLASSES.get(device.device_type)
+
+        features = CoverEntityFeature(0)
+        for capability in device.capabilities:
+            features |= COVER_FEATURE_MAP.get(capability, CoverEntityFeature(0))
+        self._attr_supported_features = features
+
+        position = as_float(device.state.get("position"))
+        self._attr_current_cover_position = None if position is None else int(max(0, min(100, position)))
+
+        status = str(device.state.get("status", "")).lower()
+        is_closed, self._attr_is_opening, self._attr_is_closing = COVER_STATE_MAP.get(status, COVER_STATE_UNKNOWN)
+        if is_closed is None and self._attr_current_cover_position is not None:
+            is_closed = self._attr_current_cover_position == 0
+        self._attr_is_closed = is_closed
+
+    async def async_open_cover(self, **kwargs):
+        self._store.enqueue_command(self._device_id, "open", {})
+
+    async def async_close_cover(self, **kwargs):
+        self._store.enqueue_command(self._device_id, "close", {})
+
+    async def async_stop_cover(self, **kwargs):
+        self._store.enqueue_command(self._device_id, "stop", {})
+
+    async def async_set_cover_position(self, **kwargs):
+        self._store.enqueue_command(self._device_id, "set_position", {"position": int(kwargs[ATTR_POSITION])})
+
+
+async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry, async_add_entities: AddEntitiesCallback) -> None:
+    async_setup_platform_entities(
+        hass,
+        entry,
+        Platform.COVER,
+        async_add_entities,
+        lambda store, device: [Control4BridgeCover(store, device.device_id)],
+    )
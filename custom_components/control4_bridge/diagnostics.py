@@ -0,0 +1,29 @@
+"""Diagnostics support for Control4 Bridge."""
+
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from .const import DOMAIN
+from .store import BridgeStore
+
+
+async def async_get_config_entry_diagnostics(hass: HomeAssistant, entry: ConfigEntry) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+
+    store: BridgeStore = hass.data[DOMAIN]["store"]
+    capture = hass.data[DOMAIN].get("capture")
+    return {
+        "options": dict(entry.options),
+        "store": store.diagnostics(),
+        "loaded_platforms": sorted(hass.data[DOMAIN]["platforms"]),
+        "entities": {
+            platform: sum(len(device_entities) for device_entities in entities.values())
+            for platform, entities in sorted(hass.data[DOMAIN]["entities"].items())
+        },
+        "request_timing": hass.data[DOMAIN]["metrics"].diagnostics(),
+        "capture": capture.diagnostics() if capture is not None else None,
+    }
@@ -2,54 +2,174 @@
 
 from __future__ import annotations
 
-from typing import Any
+from collections.abc import Callable, Iterable
+import math
 
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import Platform
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.device_registry import DeviceInfo
+from homeassistant.helpers import entity_registry as er
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.entity import Entity
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
-from .const import DOMAIN
+from .const import DOMAIN, PLATFORMS, SIGNAL_DEVICE_UPDATE, SIGNAL_DEVICES_REMOVED, SIGNAL_NEW_DEVICES
+from .models import BridgeDevice
 from .store import BridgeStore
 
 
+def as_float(value) -> float | None:
+    """Parse a numeric driver state value; anything unparsable (or NaN/inf) is None."""
+    if value is None:
+        return None
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        return None
+    return number if math.isfinite(number) else None
+
+
 class Control4BridgeEntity(Entity):
     """Base bridge entity."""
 
     _attr_should_poll = False
+    # Static identity attributes stay on the state object but are kept out of
+    # the recorder, so state history only grows with real changes.
+    _unrecorded_attributes = frozenset({"control4_device_id", "control4_room", "control4_capabilities"})
 
     def __init__(self, store: BridgeStore, device_id: str) -> None:
         self._store = store
         self._device_id = device_id
+        self._device: BridgeDevice = store.devices[device_id]
+        self._attr_unique_id = f"control4_bridge_{store.bridge_id}_{device_id}"
+        self._update_static_attributes()
+        self._update_from_device()
 
-    @property
-    def _device(self):
-        return self._store.devices[self._device_id]
+    def _update_static_attributes(self) -> None:
+        """Rebuild attributes that only depend on name, room and capabilities."""
+        device = self._device
+        self._attr_name = device.name
+        self._attr_device_info = DeviceInfo(
+            identifiers={(DOMAIN, f"{self._store.bridge_id}:{self._device_id}")},
+            manufacturer="Control4",
+            model="Bridge Device",
+            name=device.name,
+            suggested_area=device.room or None,
+        )
+        self._attr_extra_state_attributes = {
+            "control4_device_id": self._device_id,
+            "control4_room": device.room,
+            "control4_capabilities": device.capabilities,
+        }
 
-    @property
-    def name(self) -> str:
-        return self._device.name
+    def _update_from_device(self) -> None:
+        """Map the device state onto cached entity attributes."""
 
-    @property
-    def unique_id(self) -> str:
-        return f"control4_bridge_{self._store.bridge_id}_{self._device_id}"
+    async def async_update(self) -> None:
+        """Ask the driver for this device's current state (homeassistant.update_entity)."""
+        self._store.request_refresh([self._device_id])
+
+    @callback
+    def async_handle_device_update(self) -> None:
+        """Refresh cached attributes and write state after a device change."""
+        device = self._store.devices.get(self._device_id)
+        if device is not None and device is not self._device:
+            previous, self._device = self._device, device
+            if (
+                device.name != previous.name
+                or device.room != previous.room
+                or device.capabilities != previous.capabilities
+            ):
+                self._update_static_attributes()
+        self._update_from_device()
+        if self.hass is not None:
+            self.async_write_ha_state()
 
     @property
     def available(self) -> bool:
-        return self._device_id in self._store.devices
+        return self._device.available and self._store.bridge_online
 
-    @property
-    def device_info(self) -> DeviceInfo:
-        return DeviceInfo(
-            identifiers={(DOMAIN, f"{self._store.bridge_id}:{self._device_id}")},
-            manufacturer="Control4",
-            model="Bridge Device",
-            name=self._device.name,
-            suggested_area=self._device.room or None,
-        )
 
-    @property
-    def extra_state_attributes(self) -> dict[str, Any]:
-        return {
-            "control4_device_id": self._device_id,
-            "control4_room": self._device.room,
-            "control4_capabilities": self._device.capabilities,
-        }
+@callback
+def async_restored_platforms(hass: HomeAssistant, entry: ConfigEntry) -> set[Platform]:
+    """Return the platforms that already have registry entities for this entry."""
+    domains = {entity.domain for entity in er.async_entries_for_config_entry(er.async_get(hass), entry.entry_id)}
+    return {platform for platform in PLATFORMS if platform in domains}
+
+
+@callback
+def async_load_platforms(hass: HomeAssistant, platforms: Iterable[Platform]) -> None:
+    """Forward the entry to platforms not loaded yet.
+
+    Platforms are set up only once a device of theirs is synced (or its
+    entities are restored), so a light-only bridge never loads the others.
+    A newly loaded platform picks up its devices from the store's index.
+    """
+    domain_data = hass.data[DOMAIN]
+    loaded: set[Platform] = domain_data["platforms"]
+    missing = [platform for platform in platforms if platform not in loaded]
+    if not missing:
+        return
+    loaded.update(missing)
+    entry = hass.config_entries.async_get_entry(domain_data["entry_id"])
+    # Newer HA requires the late variant for forwards after setup finished.
+    forward = getattr(
+        hass.config_entries, "async_late_forward_entry_setups", hass.config_entries.async_forward_entry_setups
+    )
+    domain_data["platform_setups"].append(hass.async_create_task(forward(entry, missing)))
+
+
+EntityFactory = Callable[[BridgeStore, BridgeDevice], Iterable[Control4BridgeEntity]]
+
+
+@callback
+def async_setup_platform_entities(
+    hass: HomeAssistant,
+    entry: ConfigEntry,
+    platform: Platform,
+    async_add_entities: AddEntitiesCallback,
+    entity_factory: EntityFactory,
+) -> None:
+    """Create entities for a platform's devices and keep them updated.
+
+    The store announces devices per platform as they are first seen, so setup
+    only ever looks at new device IDs rather than sweeping every device.
+    """
+    store: BridgeStore = hass.data[DOMAIN]["store"]
+    batch_size: int = hass.data[DOMAIN]["sync_chunk_size"]
+    entities: dict[str, dict[str, Control4BridgeEntity]] = {}
+    hass.data[DOMAIN]["entities"][platform] = entities
+
+    @callback
+    def _add_devices(device_ids: Iterable[str]) -> None:
+        new_entities = []
+        for device_id in device_ids:
+            device_entities = entities.setdefault(device_id, {})
+            for entity in entity_factory(store, store.devices[device_id]):
+                if entity.unique_id in device_entities:
+                    continue
+                device_entities[entity.unique_id] = entity
+                new_entities.append(entity)
+
+        # Each call schedules its own add task, keeping every batch bounded.
+        for start in range(0, len(new_entities), batch_size):
+            async_add_entities(new_entities[start : start + batch_size])
+
+    @callback
+    def _update_devices(changed: set[str]) -> None:
+        for device_id in changed:
+            for entity in entities.get(device_id, {}).values():
+                entity.async_handle_device_update()
+
+    @callback
+    def _remove_devices(removed: set[str]) -> None:
+        # Entity removal itself follows from the device registry cleanup in the
+        # sync view; here we only drop our references.
+        for device_id in removed:
+            entities.pop(device_id, None)
+
+    _add_devices(list(store.platform_devices.get(platform, ())))
+    entry.async_on_unload(async_dispatcher_connect(hass, SIGNAL_NEW_DEVICES.format(platform), _add_devices))
+    entry.async_on_unload(async_dispatcher_connect(hass, SIGNAL_DEVICE_UPDATE, _update_devices))
+    entry.async_on_unload(async_dispatcher_connect(hass, SIGNAL_DEVICES_REMOVED, _remove_devices))
@@ -0,0 +1,40 @@
+"""Event platform for Control4 Bridge keypads."""
+
+from __future__ import annotations
+
+from homeassistant.components.event import EventEntity
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import Platform
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+
+from .const import KEYPAD_EVENT_TYPES, SIGNAL_DEVICE_EVENT
+from .entity import Control4BridgeEntity, async_setup_platform_entities
+
+
+class Control4BridgeKeypadEvent(Control4BridgeEntity, EventEntity):
+    """Bridge-backed keypad; each button action fires an event with its button."""
+
+    _attr_event_types = KEYPAD_EVENT_TYPES
+
+    async def async_added_to_hass(self) -> None:
+        await super().async_added_to_hass()
+        self.async_on_remove(
+            async_dispatcher_connect(self.hass, SIGNAL_DEVICE_EVENT.format(self._device_id), self._async_handle_event)
+        )
+
+    @callback
+    def _async_handle_event(self, button: str, action: str) -> None:
+        self._trigger_event(action, {"button": button})
+        self.async_write_ha_state()
+
+
+async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry, async_add_entities: AddEntitiesCallback) -> None:
+    async_setup_platform_entities(
+        hass,
+        entry,
+        Platform.EVENT,
+        async_add_entities,
+        lambda store, device: [Control4BridgeKeypadEvent(store, device.device_id)],
+    )
@@ -4,13 +4,11 @@ from __future__ import annotations
 
 from homeassistant.components.light import ATTR_BRIGHTNESS, ColorMode, LightEntity
 from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import Platform
 from homeassistant.core import HomeAssistant
-from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
-from .const import DOMAIN, SIGNAL_DEVICE_UPDATE
-from .entity import Control4BridgeEntity
-from .store import BridgeStore
+from .entity import Control4BridgeEntity, as_float, async_setup_platform_entities
 
 
 class Control4BridgeLight(Control4BridgeEntity, LightEntity):
@@ -19,16 +17,11 @@ class Control4BridgeLight(Control4BridgeEntity, LightEntity):
     _attr_color_mode = ColorMode.BRIGHTNESS
     _attr_supported_color_modes = {ColorMode.ONOFF, ColorMode.BRIGHTNESS}
 
-    @property
-    def is_on(self) -> bool:
-        return bool(self._device.state.get("on", False))
-
-    @property
-    def brightness(self):
-        level = self._device.state.get("brightness")
-        if level is None:
-            return None
-        return int(max(0, min(255, round(float(level) * 2.55))))
+    def _update_from_device(self) -> None:
+        state = self._device.state
+        self._attr_is_on = bool(state.get("on", False))
+        level = as_float(state.get("brightness"))
+        self._attr_brightness = None if level is None else int(max(0, min(255, round(level * 2.55))))
 
     async def async_turn_on(self, **kwargs):
         params = {}
@@ -41,23 +34,10 @@ class Control4BridgeLight(Control4BridgeEntity, LightEntity):
 
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry, async_add_entities: AddEntitiesCallback) -> None:
-    store: BridgeStore = hass.data[DOMAIN]["store"]
-    entities: dict[str, Control4BridgeLight] = {}
-
-    def _sync_entities() -> None:
-        new_entities = []
-        for device_id, device in store.devices.items():
-            if device.device_type != "light" or device_id in entities:
-                continue
-            entity = Control4BridgeLight(store, device_id)
-            entities[device_id] = entity
-            new_entities.append(entity)
-
-        if new_entities:
-            async_add_entities(new_entities)
-
-        for entity in entities.values():
-            entity.async_write_ha_state()
-
-    _sync_entities()
-    entry.async_on_unload(async_dispatcher_connect(hass, SIGNAL_DEVICE_UPDATE, _sync_entities))
+    async_setup_platform_entities(
+        hass,
+        entry,
+        Platform.LIGHT,
+        async_add_entities,
+        lambda store, device: [Control4BridgeLight(store, device.device_id)],
+    )
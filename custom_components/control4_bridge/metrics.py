@@ -0,0 +1,80 @@
+"""Per-stage request timing for the bridge views."""
+
+from __future__ import annotations
+
+from collections import deque
+import logging
+from time import monotonic
+from typing import Any
+
+from .const import DEFAULT_SLOW_REQUEST_MS, METRICS_WINDOW
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class StageTimer:
+    """Splits one request's handling time into named stages."""
+
+    __slots__ = ("started", "stages", "_last")
+
+    def __init__(self) -> None:
+        self.started = self._last = monotonic()
+        self.stages: dict[str, float] = {}
+
+    def mark(self, stage: str) -> None:
+        """Charge the time since the previous mark to ``stage``; repeats accumulate."""
+        now = monotonic()
+        self.stages[stage] = self.stages.get(stage, 0.0) + now - self._last
+        self._last = now
+
+    @property
+    def total(self) -> float:
+        return self._last - self.started
+
+
+class RequestMetrics:
+    """Rolling per-view, per-stage timings and the slow-request log."""
+
+    def __init__(self, slow_request_ms: int = DEFAULT_SLOW_REQUEST_MS, window: int = METRICS_WINDOW) -> None:
+        self.slow_request_ms = slow_request_ms
+        self.window = window
+        self.slow_requests = 0
+        # view -> stage -> recent durations in ms; "total" covers the request
+        self._samples: dict[str, dict[str, deque[float]]] = {}
+
+    def record(self, view: str, timer: StageTimer, payload_bytes: int) -> None:
+        samples = self._samples.setdefault(view, {})
+        for stage, seconds in (*timer.stages.items(), ("total", timer.total)):
+            if (stage_samples := samples.get(stage)) is None:
+                stage_samples = samples[stage] = deque(maxlen=self.window)
+            stage_samples.append(seconds * 1000)
+
+        total_ms = timer.total * 1000
+        if total_ms >= self.slow_request_ms:
+            self.slow_requests += 1
+            _LOGGER.warning(
+                "Slow %s request: %.1f ms, %d bytes (%s)",
+                view,
+                total_ms,
+                payload_bytes,
+                ", ".join(f"{stage} {seconds * 1000:.1f} ms" for stage, seconds in timer.stages.items()),
+            )
+
+    def diagnostics(self) -> dict[str, Any]:
+        """Return percentiles over the rolling window; computed only on demand."""
+        summary: dict[str, Any] = {"slow_request_ms": self.slow_request_ms, "slow_requests": self.slow_requests}
+        for view, stages in self._samples.items():
+            summary[view] = {stage: _percentiles(samples) for stage, samples in stages.items()}
+        return summary
+
+
+def _percentiles(samples: deque[float]) -> dict[str, float]:
+    ordered = sorted(samples)
+    last = len(ordered) - 1
+    return {
+        "count": len(ordered),
+        "p50": round(ordered[last * 50 // 100], 3),
+        "p95": round(ordered[last * 95 // 100], 3),
+        "p99": round(ordered[last * 99 // 100], 3),
+        "max": round(ordered[last], 3),
+    }
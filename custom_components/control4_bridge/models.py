@@ -17,6 +17,7 @@ class BridgeDevice:
     device_type: str
     capabilities: list[str] = field(default_factory=list)
     state: dict[str, Any] = field(default_factory=dict)
+    available: bool = True
 
 
 @dataclass(slots=True)
@@ -28,3 +29,39 @@ class BridgeCommand:
     action: str
     params: dict[str, Any] = field(default_factory=dict)
     created_at: str = field(default_factory=lambda: datetime.now(UTC).isoformat())
+    # Monotonic deadline after which the command is dropped unsent.
+    expires_at: float | None = None
+    # Monotonic time of the latest hand-off to the driver, and how many so far.
+    sent_at: float = 0.0
+    attempts: int = 0
+
+    def as_payload(self) -> dict[str, Any]:
+        """Return the command as sent to the driver."""
+        return {
+            "command_id": self.command_id,
+            "device_id": self.device_id,
+            "action": self.action,
+            "params": self.params,
+            "created_at": self.created_at,
+        }
+
+
+@dataclass(slots=True)
+class SyncResult:
+    """Outcome of applying a device payload to the store."""
+
+    accepted: int = 0
+    rejected: int = 0
+    changed: set[str] = field(default_factory=set)
+    added: dict[str, list[str]] = field(default_factory=dict)
+    seen: set[str] = field(default_factory=set)
+    removed: set[str] = field(default_factory=set)
+
+
+@dataclass(slots=True)
+class AckResult:
+    """Outcome of applying the driver's command acks to the store."""
+
+    acked: int = 0
+    retried: int = 0
+    failed: list[BridgeCommand] = field(default_factory=list)
@@ -0,0 +1,182 @@
+"""Bridge protocol request handling, shared by the HTTP views and the dev tools.
+
+Each handler validates one driver request, applies it to a BridgeStore and
+returns the JSON payload with its HTTP status. Authentication and anything
+that touches Home Assistant itself (device registry, dispatcher signals) stay
+with the caller, which passes them in as callbacks.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable, Callable, Iterator, Mapping
+from http import HTTPStatus
+from typing import Any
+
+from homeassistant.const import Platform
+
+from .const import (
+    ATTR_PROTOCOL_VERSION,
+    HEADER_BRIDGE_ID,
+    HEADER_DEVICES_HASH,
+    KEYPAD_EVENT_TYPES,
+    MAX_COMMAND_BATCH_SIZE,
+    PROTO_VERSION,
+)
+from .metrics import StageTimer
+from .models import SyncResult
+from .store import BridgeStore
+
+Response = tuple[dict[str, Any], HTTPStatus]
+
+
+def _normalize_maybe_array(value: Any) -> list[Any] | None:
+    """Normalize list-like payloads that may arrive as dicts with numeric keys."""
+    if isinstance(value, list):
+        return value
+    if isinstance(value, dict):
+        normalized: list[Any] = []
+        for key in sorted(value.keys(), key=lambda k: int(k) if str(k).isdigit() else str(k)):
+            normalized.append(value[key])
+        return normalized
+    return None
+
+
+def _chunked(items: list[Any], size: int) -> Iterator[list[Any]]:
+    for start in range(0, len(items), size):
+        yield items[start : start + size]
+
+
+def _error(error: str, status: HTTPStatus) -> Response:
+    return {"ok": False, "error": error}, status
+
+
+async def async_handle_sync(
+    store: BridgeStore,
+    headers: Mapping[str, str],
+    read_body: Callable[[], Awaitable[Any]],
+    lock: asyncio.Lock,
+    chunk_size: int,
+    publish: Callable[[SyncResult], None],
+    timer: StageTimer,
+) -> Response:
+    """Apply a full or partial sync; ``publish`` receives every store update."""
+    # The driver hashes the devices section of full snapshots; an unchanged
+    # snapshot is answered before the body is even read.
+    devices_hash = headers.get(HEADER_DEVICES_HASH)
+    if headers.get(HEADER_BRIDGE_ID) == store.bridge_id and store.is_unchanged_snapshot(devices_hash):
+        return {"ok": True, "unchanged": True, "pacing": store.pacing_hints()}, HTTPStatus.OK
+    timer.mark("auth")
+
+    body: dict[str, Any] = await read_body()
+    timer.mark("decode")
+
+    if body.get("bridge_id") != store.bridge_id:
+        return _error("unknown_bridge", HTTPStatus.NOT_FOUND)
+
+    if body.get(ATTR_PROTOCOL_VERSION) != PROTO_VERSION:
+        return _error("unsupported_protocol", HTTPStatus.BAD_REQUEST)
+
+    devices = _normalize_maybe_array(body.get("devices", []))
+    if devices is None:
+        return _error("invalid_devices", HTTPStatus.BAD_REQUEST)
+    timer.mark("normalize")
+
+    # Large snapshots are applied in chunks that yield to the event loop so
+    # a first sync of thousands of devices never stalls other integrations.
+    async with lock:
+        timer.mark("lock_wait")
+        total = SyncResult()
+        for index, chunk in enumerate(_chunked(devices, chunk_size)):
+            if index:
+                await asyncio.sleep(0)
+                timer.mark("yield")
+            result = store.upsert_devices(chunk)
+            total.accepted += result.accepted
+            total.rejected += result.rejected
+            total.seen |= result.seen
+            timer.mark("upsert")
+            publish(result)
+            timer.mark("publish")
+
+        partial = bool(body.get("partial", False))
+        store.mark_snapshot_applied(total, partial)
+        if partial:
+            store.counters["snapshot_partial"] += 1
+            store.remember_snapshot_hash(None)
+        else:
+            store.counters["snapshot_full"] += 1
+            publish(store.reconcile_snapshot(total))
+            store.remember_snapshot_hash(devices_hash)
+        timer.mark("reconcile")
+
+    return {"ok": True, "accepted_devices": total.accepted, "pacing": store.pacing_hints()}, HTTPStatus.OK
+
+
+def handle_commands(store: BridgeStore, query: Mapping[str, str], timer: StageTimer) -> Response:
+    """Complete piggybacked acks and hand out the next batch of commands."""
+    if query.get("bridge_id", "") != store.bridge_id:
+        return _error("unknown_bridge", HTTPStatus.NOT_FOUND)
+
+    try:
+        limit = max(1, min(MAX_COMMAND_BATCH_SIZE, int(query.get("limit", store.command_batch_size))))
+    except ValueError:
+        limit = store.command_batch_size
+    timer.mark("auth")
+
+    # Success acks piggybacked on the poll as comma-separated command IDs.
+    ack_ids = [command_id.strip() for command_id in query.get("ack", "").split(",") if command_id.strip()]
+    acked = store.ack_commands(ack_ids) if ack_ids else 0
+    timer.mark("ack")
+    commands = store.pop_commands(limit)
+    timer.mark("pop")
+
+    return {
+        "ok": True,
+        "acked": acked,
+        "commands": [cmd.as_payload() for cmd in commands],
+        "pacing": store.pacing_hints(),
+    }, HTTPStatus.OK
+
+
+def handle_ack(store: BridgeStore, body: dict[str, Any], timer: StageTimer) -> Response:
+    """Apply the driver's command acks."""
+    if body.get("bridge_id") != store.bridge_id:
+        return _error("unknown_bridge", HTTPStatus.NOT_FOUND)
+
+    acks = body.get("acks", [])
+    if not isinstance(acks, list):
+        return _error("invalid_acks", HTTPStatus.BAD_REQUEST)
+    result = store.apply_acks(acks)
+    timer.mark("ack")
+    return {"ok": True, "acked": result.acked, "retried": result.retried, "failed": len(result.failed)}, HTTPStatus.OK
+
+
+def handle_events(
+    store: BridgeStore, body: dict[str, Any], dispatch: Callable[[str, str, str], None], timer: StageTimer
+) -> Response:
+    """Validate button events; ``dispatch(device_id, button, action)`` fires each one."""
+    if body.get("bridge_id") != store.bridge_id:
+        return _error("unknown_bridge", HTTPStatus.NOT_FOUND)
+
+    events = _normalize_maybe_array(body.get("events", []))
+    if events is None:
+        return _error("invalid_events", HTTPStatus.BAD_REQUEST)
+
+    # Events go straight to the entity's own signal: no upsert, no
+    # registry work and no sweep over other devices.
+    event_devices = store.platform_devices.get(Platform.EVENT, set())
+    dispatched = 0
+    for event in events:
+        if not isinstance(event, dict) or event.get("action") not in KEYPAD_EVENT_TYPES:
+            store.counters["events_rejected"] += 1
+            continue
+        device_id = str(event.get("device_id", ""))
+        if device_id not in event_devices:
+            store.counters["events_unmatched"] += 1
+            continue
+        dispatch(device_id, str(event.get("button", "")), event["action"])
+        dispatched += 1
+    store.counters["events_dispatched"] += dispatched
+    timer.mark("dispatch")
+    return {"ok": True, "dispatched": dispatched}, HTTPStatus.OK
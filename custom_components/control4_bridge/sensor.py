@@ -0,0 +1,84 @@
+"""Sensor platform for Control4 Bridge."""
+
+from __future__ import annotations
+
+from homeassistant.components.sensor import SensorDeviceClass, SensorEntity, SensorStateClass
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import (
+    LIGHT_LUX,
+    PERCENTAGE,
+    Platform,
+    UnitOfElectricCurrent,
+    UnitOfElectricPotential,
+    UnitOfEnergy,
+    UnitOfPower,
+    UnitOfTemperature,
+)
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+
+from .entity import Control4BridgeEntity, async_setup_platform_entities
+from .store import BridgeStore
+
+# Sensor state field -> (device class, unit, state class). Unknown numeric
+# fields are still exposed as plain measurement sensors.
+SENSOR_FIELD_MAP: dict[str, tuple[SensorDeviceClass | None, str | None, SensorStateClass]] = {
+    "temperature": (SensorDeviceClass.TEMPERATURE, UnitOfTemperature.FAHRENHEIT, SensorStateClass.MEASUREMENT),
+    "humidity": (SensorDeviceClass.HUMIDITY, PERCENTAGE, SensorStateClass.MEASUREMENT),
+    "power": (SensorDeviceClass.POWER, UnitOfPower.WATT, SensorStateClass.MEASUREMENT),
+    "energy": (SensorDeviceClass.ENERGY, UnitOfEnergy.KILO_WATT_HOUR, SensorStateClass.TOTAL_INCREASING),
+    "illuminance": (SensorDeviceClass.ILLUMINANCE, LIGHT_LUX, SensorStateClass.MEASUREMENT),
+    "voltage": (SensorDeviceClass.VOLTAGE, UnitOfElectricPotential.VOLT, SensorStateClass.MEASUREMENT),
+    "current": (SensorDeviceClass.CURRENT, UnitOfElectricCurrent.AMPERE, SensorStateClass.MEASUREMENT),
+    "battery": (SensorDeviceClass.BATTERY, PERCENTAGE, SensorStateClass.MEASUREMENT),
+}
+SENSOR_FIELD_UNKNOWN: tuple[SensorDeviceClass | None, str | None, SensorStateClass] = (
+    None,
+    None,
+    SensorStateClass.MEASUREMENT,
+)
+
+
+def _numeric_fields(state: dict) -> list[str]:
+    return [key for key, value in state.items() if isinstance(value, (int, float)) and not isinstance(value, bool)]
+
+
+class Control4BridgeSensor(Control4BridgeEntity, SensorEntity):
+    """Bridge-backed numeric sensor for one field of a device state."""
+
+    def __init__(self, store: BridgeStore, device_id: str, field: str) -> None:
+        self._field = field
+        (
+            self._attr_device_class,
+            self._attr_native_unit_of_measurement,
+            self._attr_state_class,
+        ) = SENSOR_FIELD_MAP.get(field, SENSOR_FIELD_UNKNOWN)
+        super().__init__(store, device_id)
+        self._attr_unique_id = f"control4_bridge_{store.bridge_id}_{device_id}_{field}"
+
+    def _update_static_attributes(self) -> None:
+        super()._update_static_attributes()
+        self._attr_name = f"{self._device.name} {self._field.replace('_', ' ').title()}"
+
+    def _update_from_device(self) -> None:
+        state = self._device.state
+        self._attr_native_value = state.get(self._field)
+        if self._field == "temperature":
+            # Set on every update: a thermostat can switch its scale either way.
+            self._attr_native_unit_of_measurement = (
+                UnitOfTemperature.CELSIUS
+                if str(state.get("scale", "")).upper() == "C"
+                else UnitOfTemperature.FAHRENHEIT
+            )
+
+
+async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry, async_add_entities: AddEntitiesCallback) -> None:
+    async_setup_platform_entities(
+        hass,
+        entry,
+        Platform.SENSOR,
+        async_add_entities,
+        lambda store, device: [
+            Control4BridgeSensor(store, device.device_id, field) for field in _numeric_fields(device.state)
+        ],
+    )
@@ -2,13 +2,67 @@
 
 from __future__ import annotations
 
+import asyncio
+from datetime import datetime, timedelta
+import logging
+
+import voluptuous as vol
+
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.const import ATTR_ENTITY_ID
+from homeassistant.core import HomeAssistant, ServiceCall, callback
+from homeassistant.helpers import config_validation as cv, device_registry as dr, entity_registry as er
+from homeassistant.helpers.dispatcher import async_dispatcher_send
+from homeassistant.helpers.event import async_track_time_interval
 
 from .api import async_register_views
-from .const import CONF_BRIDGE_ID, CONF_SHARED_SECRET, DOMAIN, PLATFORMS
+from .capture import TrafficCapture
+from .const import (
+    ATTR_DEVICE_IDS,
+    CAPTURE_FILENAME,
+    COMMAND_TTL_DEFAULTS,
+    CONF_BRIDGE_ID,
+    CONF_CAPTURE_TRAFFIC,
+    CONF_COMMAND_BATCH_SIZE,
+    CONF_COMMAND_BURST,
+    CONF_COMMAND_RATE,
+    CONF_COMMAND_TTL_PREFIX,
+    CONF_ORPHAN_SNAPSHOTS,
+    CONF_SHARED_SECRET,
+    CONF_SLOW_REQUEST_MS,
+    CONF_STALE_AFTER,
+    CONF_SYNC_CHUNK_SIZE,
+    DATA_VIEWS_REGISTERED,
+    DEFAULT_CAPTURE_TRAFFIC,
+    DEFAULT_COMMAND_BATCH_SIZE,
+    DEFAULT_COMMAND_BURST,
+    DEFAULT_COMMAND_RATE,
+    DEFAULT_ORPHAN_SNAPSHOTS,
+    DEFAULT_SLOW_REQUEST_MS,
+    DEFAULT_STALE_AFTER,
+    DEFAULT_SYNC_CHUNK_SIZE,
+    DOMAIN,
+    LIVENESS_CHECK_SECONDS,
+    SERVICE_REFRESH,
+    SIGNAL_DEVICE_UPDATE,
+)
+from .entity import async_restored_platforms
+from .metrics import RequestMetrics
+from .push import CommandPusher
 from .store import BridgeStore
 
+_LOGGER = logging.getLogger(__name__)
+
+REFRESH_SCHEMA = vol.All(
+    vol.Schema(
+        {
+            vol.Optional(ATTR_ENTITY_ID): cv.entity_ids,
+            vol.Optional(ATTR_DEVICE_IDS): vol.All(cv.ensure_list, [cv.string]),
+        }
+    ),
+    cv.has_at_least_one_key(ATTR_ENTITY_ID, ATTR_DEVICE_IDS),
+)
+
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up Control4 Bridge from a config entry."""
@@ -16,17 +70,93 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     hass.data.setdefault(DOMAIN, {})
     hass.data[DOMAIN]["entry_id"] = entry.entry_id
     hass.data[DOMAIN]["shared_secret"] = entry.data[CONF_SHARED_SECRET]
-    hass.data[DOMAIN]["store"] = BridgeStore(entry.data[CONF_BRIDGE_ID])
+    hass.data[DOMAIN]["sync_chunk_size"] = int(entry.options.get(CONF_SYNC_CHUNK_SIZE, DEFAULT_SYNC_CHUNK_SIZE))
+    hass.data[DOMAIN]["sync_lock"] = asyncio.Lock()
+    store = hass.data[DOMAIN]["store"] = BridgeStore(
+        entry.data[CONF_BRIDGE_ID],
+        orphan_snapshots=int(entry.options.get(CONF_ORPHAN_SNAPSHOTS, DEFAULT_ORPHAN_SNAPSHOTS)),
+        command_batch_size=int(entry.options.get(CONF_COMMAND_BATCH_SIZE, DEFAULT_COMMAND_BATCH_SIZE)),
+        command_rate=float(entry.options.get(CONF_COMMAND_RATE, DEFAULT_COMMAND_RATE)),
+        command_burst=int(entry.options.get(CONF_COMMAND_BURST, DEFAULT_COMMAND_BURST)),
+        stale_after=int(entry.options.get(CONF_STALE_AFTER, DEFAULT_STALE_AFTER)),
+        command_ttls={
+            action: int(entry.options.get(f"{CONF_COMMAND_TTL_PREFIX}{action}", default))
+            for action, default in COMMAND_TTL_DEFAULTS.items()
+        },
+    )
+    pusher = hass.data[DOMAIN]["push"] = CommandPusher(hass, store, entry.data[CONF_SHARED_SECRET])
+    store.on_command_enqueued = pusher.async_schedule
+    store.on_command_deferred = pusher.async_schedule_later
+    hass.data[DOMAIN]["metrics"] = RequestMetrics(
+        int(entry.options.get(CONF_SLOW_REQUEST_MS, DEFAULT_SLOW_REQUEST_MS))
+    )
+    if entry.options.get(CONF_CAPTURE_TRAFFIC, DEFAULT_CAPTURE_TRAFFIC):
+        capture = hass.data[DOMAIN]["capture"] = TrafficCapture(hass, hass.config.path(CAPTURE_FILENAME))
+        await capture.async_load()
+
+    # Other platforms are forwarded when their first device is synced.
+    platforms = hass.data[DOMAIN]["platforms"] = async_restored_platforms(hass, entry)
+    hass.data[DOMAIN]["platform_setups"] = []
+    # platform -> device_id -> unique_id -> entity, kept by the platforms
+    hass.data[DOMAIN]["entities"] = {}
+
+    # Views outlive config entry reloads; aiohttp cannot register them twice.
+    if not hass.data.get(DATA_VIEWS_REGISTERED):
+        async_register_views(hass)
+        hass.data[DATA_VIEWS_REGISTERED] = True
+    await hass.config_entries.async_forward_entry_setups(entry, platforms)
+    entry.async_on_unload(entry.add_update_listener(_async_update_listener))
 
-    async_register_views(hass)
-    await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+    @callback
+    def _async_check_liveness(_now: datetime) -> None:
+        # One timer for the whole bridge; entities never track time themselves.
+        if store.check_liveness():
+            _LOGGER.warning("No contact from Control4 bridge %s for %s seconds", store.bridge_id, store.stale_after)
+            async_dispatcher_send(hass, SIGNAL_DEVICE_UPDATE, set(store.devices))
+
+    entry.async_on_unload(
+        async_track_time_interval(hass, _async_check_liveness, timedelta(seconds=LIVENESS_CHECK_SECONDS))
+    )
+
+    async def _async_refresh(call: ServiceCall) -> None:
+        """Have the driver re-send the targeted devices as a partial sync."""
+        device_ids = set(call.data.get(ATTR_DEVICE_IDS, ()))
+        # Entities map to bridge devices through the device registry, whose
+        # identifier is "<bridge_id>:<device_id>" for every entity type.
+        prefix = f"{store.bridge_id}:"
+        entity_registry = er.async_get(hass)
+        device_registry = dr.async_get(hass)
+        for entity_id in call.data.get(ATTR_ENTITY_ID, ()):
+            registry_entry = entity_registry.async_get(entity_id)
+            if registry_entry is None or registry_entry.device_id is None:
+                continue
+            if (device := device_registry.async_get(registry_entry.device_id)) is None:
+                continue
+            for domain, identifier in device.identifiers:
+                if domain == DOMAIN and identifier.startswith(prefix):
+                    device_ids.add(identifier.removeprefix(prefix))
+        store.request_refresh(device_ids)
+
+    hass.services.async_register(DOMAIN, SERVICE_REFRESH, _async_refresh, schema=REFRESH_SCHEMA)
+    entry.async_on_unload(lambda: hass.services.async_remove(DOMAIN, SERVICE_REFRESH))
     return True
 
 
+async def _async_update_listener(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Reload the entry so option changes take effect."""
+
+    await hass.config_entries.async_reload(entry.entry_id)
+
+
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
 
-    unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
+    if setups := hass.data[DOMAIN]["platform_setups"]:
+        await asyncio.gather(*setups)
+    unload_ok = await hass.config_entries.async_unload_platforms(entry, hass.data[DOMAIN]["platforms"])
     if unload_ok:
+        await hass.data[DOMAIN]["push"].async_stop()
+        if (capture := hass.data[DOMAIN].get("capture")) is not None:
+            await capture.async_close()
         hass.data.pop(DOMAIN, None)
     return unload_ok
@@ -0,0 +1,93 @@
+"""Opt-in capture of bridge traffic for offline replay."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+from time import monotonic
+
+from aiohttp import web
+
+from homeassistant.core import HomeAssistant, callback
+
+from .const import CAPTURE_FLUSH_SECONDS, CAPTURE_MAX_BYTES, HEADER_BRIDGE_ID, HEADER_DEVICES_HASH
+
+# Only these request headers are recorded; the shared secret never is.
+CAPTURED_HEADERS = (HEADER_BRIDGE_ID, HEADER_DEVICES_HASH)
+
+
+class TrafficCapture:
+    """Append sanitized bridge requests, with timing, to a JSON lines file."""
+
+    def __init__(self, hass: HomeAssistant, path: str, max_bytes: int = CAPTURE_MAX_BYTES) -> None:
+        self.hass = hass
+        self.path = path
+        self.max_bytes = max_bytes
+        self.records = 0
+        self.dropped = 0
+        self._started = monotonic()
+        self._written = 0
+        self._pending: list[str] = []
+        self._flush_handle: asyncio.TimerHandle | None = None
+        self._flush_task: asyncio.Future | None = None
+
+    async def async_load(self) -> None:
+        """Count an existing file against the size cap; appends survive restarts."""
+        self._written = await self.hass.async_add_executor_job(self._existing_size)
+
+    def _existing_size(self) -> int:
+        try:
+            return os.path.getsize(self.path)
+        except FileNotFoundError:
+            return 0
+
+    @callback
+    def async_record(
+        self, kind: str, request: web.Request, body: bytes, status: int, started: float, elapsed: float
+    ) -> None:
+        """Queue one request; lines are written in batches off the event loop."""
+        if self._written >= self.max_bytes:
+            self.dropped += 1
+            return
+
+        line = json.dumps(
+            {
+                "t": round(started - self._started, 4),
+                "kind": kind,
+                "method": request.method,
+                "query": dict(request.query),
+                "headers": {name: request.headers[name] for name in CAPTURED_HEADERS if name in request.headers},
+                "body": body.decode("utf-8", "replace") if body else None,
+                "status": status,
+                "ms": round(elapsed * 1000, 2),
+            },
+            separators=(",", ":"),
+        )
+        self._written += len(line) + 1
+        self._pending.append(line)
+        self.records += 1
+        if self._flush_handle is None:
+            self._flush_handle = self.hass.loop.call_later(CAPTURE_FLUSH_SECONDS, self._async_flush)
+
+    @callback
+    def _async_flush(self) -> None:
+        self._flush_handle = None
+        lines, self._pending = self._pending, []
+        if lines:
+            self._flush_task = self.hass.async_add_executor_job(self._append, lines)
+
+    async def async_close(self) -> None:
+        """Write out anything still buffered."""
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+        self._async_flush()
+        if self._flush_task is not None:
+            await self._flush_task
+
+    def _append(self, lines: list[str]) -> None:
+        with open(self.path, "a", encoding="utf-8") as capture_file:
+            capture_file.write("\n".join(lines) + "\n")
+
+    def diagnostics(self) -> dict[str, object]:
+        return {"path": self.path, "records": self.records, "dropped": self.dropped, "bytes": self._written}
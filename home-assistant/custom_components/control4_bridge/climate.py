@@ -0,0 +1,131 @@
+"""Climate platform for Control4 Bridge."""
+
+from __future__ import annotations
+
+from homeassistant.components.climate import (
+    ATTR_TARGET_TEMP_HIGH,
+    ATTR_TARGET_TEMP_LOW,
+    FAN_AUTO,
+    FAN_ON,
+    ClimateEntity,
+    ClimateEntityFeature,
+    HVACAction,
+    HVACMode,
+)
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import ATTR_TEMPERATURE, Platform, UnitOfTemperature
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+
+from .entity import Control4BridgeEntity, as_float, async_setup_platform_entities
+
+# Control4 thermostat HVAC mode <-> HA HVAC mode.
+HVAC_MODE_MAP: dict[str, HVACMode] = {
+    "off": HVACMode.OFF,
+    "heat": HVACMode.HEAT,
+    "cool": HVACMode.COOL,
+    "auto": HVACMode.HEAT_COOL,
+}
+HVAC_MODE_TO_C4: dict[HVACMode, str] = {
+    HVACMode.OFF: "Off",
+    HVACMode.HEAT: "Heat",
+    HVACMode.COOL: "Cool",
+    HVACMode.HEAT_COOL: "Auto",
+}
+
+HVAC_ACTION_MAP: dict[str, HVACAction] = {
+    "off": HVACAction.OFF,
+    "idle": HVACAction.IDLE,
+    "heat": HVACAction.HEATING,
+    "heating": HVACAction.HEATING,
+    "cool": HVACAction.COOLING,
+    "cooling": HVACAction.COOLING,
+    "fan": HVACAction.FAN,
+}
+
+FAN_MODE_MAP: dict[str, str] = {
+    "auto": FAN_AUTO,
+    "on": FAN_ON,
+    "circulate": "circulate",
+}
+FAN_MODE_TO_C4: dict[str, str] = {
+    FAN_AUTO: "Auto",
+    FAN_ON: "On",
+    "circulate": "Circulate",
+}
+
+TEMPERATURE_SCALE_MAP: dict[str, str] = {
+    "f": UnitOfTemperature.FAHRENHEIT,
+    "c": UnitOfTemperature.CELSIUS,
+}
+
+CLIMATE_FEATURE_MAP: dict[str, ClimateEntityFeature] = {
+    "setpoint_heat": ClimateEntityFeature.TARGET_TEMPERATURE,
+    "setpoint_cool": ClimateEntityFeature.TARGET_TEMPERATURE,
+    "setpoint_range": ClimateEntityFeature.TARGET_TEMPERATURE_RANGE,
+    "fan_mode": ClimateEntityFeature.FAN_MODE,
+}
+
+
+class Control4BridgeClimate(Control4BridgeEntity, ClimateEntity):
+    """Bridge-backed thermostat entity."""
+
+    _attr_hvac_modes = list(HVAC_MODE_TO_C4)
+    _attr_fan_modes = list(FAN_MODE_TO_C4)
+
+    def _update_from_device(self) -> None:
+        device = self._device
+        state = device.state
+
+        features = ClimateEntityFeature(0)
+        for capability in device.capabilities:
+            features |= CLIMATE_FEATURE_MAP.get(capability, ClimateEntityFeature(0))
+        self._attr_supported_features = features
+
+        self._attr_temperature_unit = TEMPERATURE_SCALE_MAP.get(
+            str(state.get("scale", "f")).lower(), UnitOfTemperature.FAHRENHEIT
+        )
+        self._attr_hvac_mode = HVAC_MODE_MAP.get(str(state.get("hvac_mode", "")).lower())
+        self._attr_hvac_action = HVAC_ACTION_MAP.get(str(state.get("hvac_action", "")).lower())
+        self._attr_fan_mode = FAN_MODE_MAP.get(str(state.get("fan_mode", "")).lower())
+        self._attr_current_temperature = as_float(state.get("current_temperature"))
+
+        heat_setpoint = as_float(state.get("heat_setpoint"))
+        cool_setpoint = as_float(state.get("cool_setpoint"))
+        self._attr_target_temperature_low = heat_setpoint
+        self._attr_target_temperature_high = cool_setpoint
+        if self._attr_hvac_mode == HVACMode.HEAT:
+            self._attr_target_temperature = heat_setpoint
+        elif self._attr_hvac_mode == HVACMode.COOL:
+            self._attr_target_temperature = cool_setpoint
+        else:
+            self._attr_target_temperature = None
+
+    async def async_set_hvac_mode(self, hvac_mode: HVACMode) -> None:
+        self._store.enqueue_command(self._device_id, "set_hvac_mode", {"mode": HVAC_MODE_TO_C4[hvac_mode]})
+
+    async def async_set_fan_mode(self, fan_mode: str) -> None:
+        self._store.enqueue_command(self._device_id, "set_fan_mode", {"mode": FAN_MODE_TO_C4[fan_mode]})
+
+    async def async_set_temperature(self, **kwargs) -> None:
+        params = {}
+        if ATTR_TEMPERATURE in kwargs:
+            key = "cool_setpoint" if self._attr_hvac_mode == HVACMode.COOL else "heat_setpoint"
+            params[key] = kwargs[ATTR_TEMPERATURE]
+        if ATTR_TARGET_TEMP_LOW in kwargs:
+            params["heat_setpoint"] = kwargs[ATTR_TARGET_TEMP_LOW]
+        if ATTR_TARGET_TEMP_HIGH in kwargs:
+            params["cool_setpoint"] = kwargs[ATTR_TARGET_TEMP_HIGH]
+        if params:
+            params["scale"] = "C" if self._attr_temperature_unit == UnitOfTemperature.CELSIUS else "F"
+            self._store.enqueue_command(self._device_id, "set_setpoints", params)
+
+
+async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry, async_add_entities: AddEntitiesCallback) -> None:
+    async_setup_platform_entities(
+        hass,
+        entry,
+        Platform.CLIMATE,
+        async_add_entities,
+        lambda store, device: [Control4BridgeClimate(store, device.device_id)],
+    )
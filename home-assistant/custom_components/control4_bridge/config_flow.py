@@ -9,7 +9,32 @@ import voluptuous as vol
 from homeassistant import config_entries
 from homeassistant.helpers import selector
 
-from .const import CONF_BRIDGE_ID, CONF_SHARED_SECRET, DEFAULT_BRIDGE_ID, DEFAULT_NAME, DOMAIN
+from .const import (
+    COMMAND_TTL_DEFAULTS,
+    CONF_BRIDGE_ID,
+    CONF_CAPTURE_TRAFFIC,
+    CONF_COMMAND_BATCH_SIZE,
+    CONF_COMMAND_BURST,
+    CONF_COMMAND_RATE,
+    CONF_COMMAND_TTL_PREFIX,
+    CONF_ORPHAN_SNAPSHOTS,
+    CONF_SHARED_SECRET,
+    CONF_SLOW_REQUEST_MS,
+    CONF_STALE_AFTER,
+    CONF_SYNC_CHUNK_SIZE,
+    DEFAULT_BRIDGE_ID,
+    DEFAULT_CAPTURE_TRAFFIC,
+    DEFAULT_COMMAND_BATCH_SIZE,
+    DEFAULT_COMMAND_BURST,
+    DEFAULT_COMMAND_RATE,
+    DEFAULT_NAME,
+    DEFAULT_ORPHAN_SNAPSHOTS,
+    DEFAULT_SLOW_REQUEST_MS,
+    DEFAULT_STALE_AFTER,
+    DEFAULT_SYNC_CHUNK_SIZE,
+    DOMAIN,
+    MAX_COMMAND_BATCH_SIZE,
+)
 
 
 class Control4BridgeConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
@@ -75,9 +100,44 @@ class Control4BridgeOptionsFlow(config_entries.OptionsFlowWithConfigEntry):
             data_schema=vol.Schema(
                 {
                     vol.Optional(
-                        "command_batch_size",
-                        default=int(options.get("command_batch_size", 25)),
+                        CONF_COMMAND_BATCH_SIZE,
+                        default=int(options.get(CONF_COMMAND_BATCH_SIZE, DEFAULT_COMMAND_BATCH_SIZE)),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=1, max=MAX_COMMAND_BATCH_SIZE)),
+                    vol.Optional(
+                        CONF_COMMAND_RATE,
+                        default=float(options.get(CONF_COMMAND_RATE, DEFAULT_COMMAND_RATE)),
+                    ): vol.All(vol.Coerce(float), vol.Range(min=0, max=100)),
+                    vol.Optional(
+                        CONF_COMMAND_BURST,
+                        default=int(options.get(CONF_COMMAND_BURST, DEFAULT_COMMAND_BURST)),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=1, max=100)),
+                    vol.Optional(
+                        CONF_ORPHAN_SNAPSHOTS,
+                        default=int(options.get(CONF_ORPHAN_SNAPSHOTS, DEFAULT_ORPHAN_SNAPSHOTS)),
                     ): vol.All(vol.Coerce(int), vol.Range(min=1, max=100)),
+                    vol.Optional(
+                        CONF_STALE_AFTER,
+                        default=int(options.get(CONF_STALE_AFTER, DEFAULT_STALE_AFTER)),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=30, max=86400)),
+                    vol.Optional(
+                        CONF_SYNC_CHUNK_SIZE,
+                        default=int(options.get(CONF_SYNC_CHUNK_SIZE, DEFAULT_SYNC_CHUNK_SIZE)),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=10, max=5000)),
+                    vol.Optional(
+                        CONF_SLOW_REQUEST_MS,
+                        default=int(options.get(CONF_SLOW_REQUEST_MS, DEFAULT_SLOW_REQUEST_MS)),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=10, max=60000)),
+                    vol.Optional(
+                        CONF_CAPTURE_TRAFFIC,
+                        default=bool(options.get(CONF_CAPTURE_TRAFFIC, DEFAULT_CAPTURE_TRAFFIC)),
+                    ): bool,
+                    **{
+                        vol.Optional(
+                            f"{CONF_COMMAND_TTL_PREFIX}{action}",
+                            default=int(options.get(f"{CONF_COMMAND_TTL_PREFIX}{action}", default)),
+                        ): vol.All(vol.Coerce(int), vol.Range(min=0, max=86400))
+                        for action, default in COMMAND_TTL_DEFAULTS.items()
+                    },
                 }
             ),
         )
@@ -0,0 +1,52 @@
+"""Lock platform for Control4 Bridge."""
+
+from __future__ import annotations
+
+from homeassistant.components.lock import LockEntity
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import Platform
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+
+from .entity import Control4BridgeEntity, async_setup_platform_entities
+
+# Control4 lock_status -> (is_locked, is_locking, is_unlocking, is_jammed)
+LOCK_STATE_MAP: dict[str, tuple[bool | None, bool, bool, bool]] = {
+    "locked": (True, False, False, False),
+    "unlocked": (False, False, False, False),
+    "open": (False, False, False, False),
+    "locking": (False, True, False, False),
+    "unlocking": (True, False, True, False),
+    "jammed": (None, False, False, True),
+    "fault": (None, False, False, True),
+}
+LOCK_STATE_UNKNOWN: tuple[bool | None, bool, bool, bool] = (None, False, False, False)
+
+
+class Control4BridgeLock(Control4BridgeEntity, LockEntity):
+    """Bridge-backed lock entity."""
+
+    def _update_from_device(self) -> None:
+        status = str(self._device.state.get("lock_status", "")).lower()
+        (
+            self._attr_is_locked,
+            self._attr_is_locking,
+            self._attr_is_unlocking,
+            self._attr_is_jammed,
+        ) = LOCK_STATE_MAP.get(status, LOCK_STATE_UNKNOWN)
+
+    async def async_lock(self, **kwargs):
+        self._store.enqueue_command(self._device_id, "lock", {})
+
+    async def async_unlock(self, **kwargs):
+        self._store.enqueue_command(self._device_id, "unlock", {})
+
+
+async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry, async_add_entities: AddEntitiesCallback) -> None:
+    async_setup_platform_entities(
+        hass,
+        entry,
+        Platform.LOCK,
+        async_add_entities,
+        lambda store, device: [Control4BridgeLock(store, device.device_id)],
+    )
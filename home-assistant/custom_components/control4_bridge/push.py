@@ -0,0 +1,130 @@
+"""Push delivery of queued commands to the driver's HTTP listener."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from time import monotonic
+from typing import Any
+
+import aiohttp
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
+
+from .const import DRIVER_PUSH_PATH, HEADER_SECRET, PUSH_RETRY_SECONDS, PUSH_TIMEOUT_SECONDS
+from .store import BridgeStore
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class CommandPusher:
+    """Send commands to the driver as soon as they are queued.
+
+    Commands enqueued in the same event-loop tick go out in one request over
+    HA's shared (keep-alive) client session. The driver executes them and
+    returns acks in the response; retryable failures are pushed again right
+    away. Commands held back by the per-device rate limit get a push timed
+    for when they can be released. On any transport failure the commands are requeued for polling and
+    push pauses for ``PUSH_RETRY_SECONDS``.
+    """
+
+    def __init__(self, hass: HomeAssistant, store: BridgeStore, shared_secret: str) -> None:
+        self.hass = hass
+        self.store = store
+        self.shared_secret = shared_secret
+        self.endpoint: str | None = None
+        self._scheduled = False
+        self._task: asyncio.Task | None = None
+        self._wake: asyncio.TimerHandle | None = None
+        self._retry_at = 0.0
+
+    @callback
+    def async_set_endpoint(self, host: str | None, port: Any) -> None:
+        """Track the listener port the driver announces on every sync."""
+        try:
+            port = int(port)
+        except (TypeError, ValueError):
+            port = 0
+        endpoint = f"http://{host}:{port}{DRIVER_PUSH_PATH}" if host and 0 < port < 65536 else None
+        if endpoint != self.endpoint:
+            # Push counts as active only once a push to this endpoint succeeds.
+            self.endpoint = endpoint
+            self._retry_at = 0.0
+            self.store.push_active = False
+
+    @callback
+    def async_schedule(self) -> None:
+        """Queue a push for the end of the current loop tick."""
+        if self._scheduled or self.endpoint is None:
+            return
+        self._scheduled = True
+        self.hass.loop.call_soon(self._async_start)
+
+    @callback
+    def async_schedule_later(self, delay: float) -> None:
+        """Queue a push for ``delay`` seconds from now, unless one is due sooner."""
+        if self.endpoint is None:
+            return
+        when = self.hass.loop.time() + delay
+        if self._wake is not None:
+            if self._wake.when() <= when:
+                return
+            self._wake.cancel()
+        self._wake = self.hass.loop.call_at(when, self._async_wake)
+
+    @callback
+    def _async_wake(self) -> None:
+        self._wake = None
+        self.async_schedule()
+
+    @callback
+    def _async_start(self) -> None:
+        self._scheduled = False
+        if self._task is None or self._task.done():
+            self._task = self.hass.async_create_background_task(self._async_push(), "control4_bridge_push")
+
+    async def _async_push(self) -> None:
+        store = self.store
+        while self.endpoint is not None and monotonic() >= self._retry_at:
+            commands = store.pop_commands(store.command_batch_size)
+            if not commands:
+                return
+
+            command_ids = [command.command_id for command in commands]
+            try:
+                acks = await self._async_post([command.as_payload() for command in commands])
+            except (aiohttp.ClientError, asyncio.TimeoutError, ValueError) as err:
+                store.requeue_commands(command_ids)
+                store.counters["push_failed"] += 1
+                store.push_active = False
+                self._retry_at = monotonic() + PUSH_RETRY_SECONDS
+                _LOGGER.debug("Command push to %s failed, falling back to polling: %s", self.endpoint, err)
+                return
+
+            store.push_active = True
+            store.counters["commands_pushed"] += len(commands)
+            store.apply_acks(acks)
+
+    async def _async_post(self, commands: list[dict[str, Any]]) -> list[Any]:
+        session = async_get_clientsession(self.hass)
+        async with session.post(
+            self.endpoint,
+            json={"bridge_id": self.store.bridge_id, "commands": commands},
+            headers={HEADER_SECRET: self.shared_secret},
+            timeout=aiohttp.ClientTimeout(total=PUSH_TIMEOUT_SECONDS),
+        ) as response:
+            response.raise_for_status()
+            body = await response.json(content_type=None)
+        acks = body.get("acks") if isinstance(body, dict) else None
+        if not isinstance(acks, list):
+            raise ValueError("push response without acks")
+        return acks
+
+    async def async_stop(self) -> None:
+        self.store.on_command_enqueued = None
+        self.store.on_command_deferred = None
+        if self._wake is not None:
+            self._wake.cancel()
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
@@ -2,11 +2,41 @@
 
 from __future__ import annotations
 
-from collections import deque
+from collections import Counter, deque
+from collections.abc import Callable, Iterable
+from dataclasses import replace
+import logging
 from secrets import token_hex
+from time import monotonic
 from typing import Any
 
-from .models import BridgeCommand, BridgeDevice
+from .const import (
+    COMMAND_INTENT_GROUPS,
+    COMMAND_TTL_DEFAULTS,
+    DEFAULT_COMMAND_BATCH_SIZE,
+    DEFAULT_COMMAND_BURST,
+    DEFAULT_COMMAND_RATE,
+    DEFAULT_ORPHAN_SNAPSHOTS,
+    DEFAULT_SENSOR_THROTTLE,
+    DEFAULT_STALE_AFTER,
+    DEVICE_TYPE_PLATFORMS,
+    INFLIGHT_TIMEOUT_SECONDS,
+    MAX_COMMAND_ATTEMPTS,
+    MAX_COMMAND_BATCH_SIZE,
+    PACING_ACTIVE_POLL_MS,
+    PACING_ACTIVE_WINDOW_SECONDS,
+    PACING_BURST_POLL_MS,
+    PACING_DEFAULT_POLL_MS,
+    PACING_IDLE_AFTER_SECONDS,
+    PACING_IDLE_POLL_MS,
+    PACING_IDLE_SYNC_MS,
+    PACING_PUSH_POLL_MS,
+    PACING_SYNC_MS,
+    SENSOR_THROTTLE_DEFAULTS,
+)
+from .models import AckResult, BridgeCommand, BridgeDevice, SyncResult
+
+_LOGGER = logging.getLogger(__name__)
 
 
 def _normalize_maybe_array(value: Any) -> list[Any]:
@@ -17,58 +47,511 @@ def _normalize_maybe_array(value: Any) -> list[Any]:
     return []
 
 
+def _intent_key(device_id: str, action: str) -> tuple[str, str]:
+    return device_id, COMMAND_INTENT_GROUPS.get(action, action)
+
+
+def _sent_keys(command: BridgeCommand) -> list[tuple[str, str]]:
+    """Return the (device, intent group) pairs a sent command speaks for."""
+    if command.action == "refresh":
+        return [(device_id, "refresh") for device_id in command.params.get("device_ids", ())]
+    return [_intent_key(command.device_id, command.action)]
+
+
+def _merge_intent(pending: BridgeCommand, command: BridgeCommand) -> None:
+    """Fold a throttled command into the pending one of its intent group; the latest intent wins."""
+    if pending.action == command.action:
+        pending.params = {**pending.params, **command.params}
+    else:
+        pending.action = command.action
+        pending.params = command.params
+    pending.expires_at = command.expires_at
+
+
+def _fields_grew(previous: BridgeDevice, device: BridgeDevice) -> bool:
+    """Return True when a sensor reports state fields it did not have before."""
+    return device.device_type == "sensor" and not device.state.keys() <= previous.state.keys()
+
+
+def _action_summary(stats: Counter[str]) -> dict[str, Any]:
+    completed = stats["success"] + stats["failed"] + stats["retried"]
+    return {
+        "success": stats["success"],
+        "failed": stats["failed"],
+        "retried": stats["retried"],
+        "latency_ms_avg": round(stats["latency_ms_total"] / completed, 1) if completed else 0.0,
+        "latency_ms_max": round(stats["latency_ms_max"], 1),
+    }
+
+
 class BridgeStore:
     """In-memory bridge state and command queue."""
 
-    def __init__(self, bridge_id: str) -> None:
+    def __init__(
+        self,
+        bridge_id: str,
+        orphan_snapshots: int = DEFAULT_ORPHAN_SNAPSHOTS,
+        command_batch_size: int = DEFAULT_COMMAND_BATCH_SIZE,
+        command_ttls: dict[str, float] | None = None,
+        command_rate: float = DEFAULT_COMMAND_RATE,
+        command_burst: int = DEFAULT_COMMAND_BURST,
+        stale_after: float = DEFAULT_STALE_AFTER,
+    ) -> None:
         self.bridge_id = bridge_id
+        self.orphan_snapshots = max(1, orphan_snapshots)
+        self.command_batch_size = max(1, min(MAX_COMMAND_BATCH_SIZE, command_batch_size))
+        self.command_ttls: dict[str, float] = dict(COMMAND_TTL_DEFAULTS if command_ttls is None else command_ttls)
         self.devices: dict[str, BridgeDevice] = {}
+        self.platform_devices: dict[str, set[str]] = {}
         self._commands: deque[BridgeCommand] = deque()
         self._inflight: dict[str, BridgeCommand] = {}
+        self.command_rate = max(0.0, command_rate)
+        self.command_burst = max(1, command_burst)
+        # device_id -> (tokens, monotonic time of last refill)
+        self._buckets: dict[str, tuple[float, float]] = {}
+        # Newest still-queued command per (device, intent group), the merge
+        # target when throttled.
+        self._latest_queued: dict[tuple[str, str], BridgeCommand] = {}
+        # device_id -> intent group -> throttled command with nothing queued to
+        # merge into; released in order on pop as the device's bucket refills.
+        self._deferred: dict[str, dict[str, BridgeCommand]] = {}
+        self.throttled_devices: Counter[str] = Counter()
+        # device_id -> intent group -> ID of the command most recently sent for
+        # it; an older command is never resent after a newer one of its group
+        # went out. A refresh is recorded under "refresh" for each of its devices.
+        self._last_sent: dict[str, dict[str, str]] = {}
+        # device_id -> field -> (last published value, monotonic publish time)
+        self._sensor_published: dict[str, dict[str, tuple[float, float]]] = {}
+        # Sensors with a reading currently held back by their throttle.
+        self._held_sensors: set[str] = set()
+        self._missed_snapshots: dict[str, int] = {}
+        self._snapshot_hash: str | None = None
+        self.counters: Counter[str] = Counter()
+        # action -> success/failed/retried counts and ack latency totals
+        self.action_stats: dict[str, Counter[str]] = {}
+        self._last_command_at: float | None = None
+        self._needs_full_snapshot = True
+        # Bridge liveness: one flag that every entity's `available` reads.
+        self.stale_after = stale_after
+        self.bridge_online = True
+        self._last_contact = monotonic()
+        # Set while commands are pushed to the driver; called on every enqueue.
+        self.push_active = False
+        self.on_command_enqueued: Callable[[], None] | None = None
+        # Called with the seconds until the next deferred command can be released.
+        self.on_command_deferred: Callable[[float], None] | None = None
 
-    def upsert_devices(self, raw_devices: list[dict[str, Any]]) -> int:
-        accepted = 0
+    def upsert_devices(self, raw_devices: list[dict[str, Any]]) -> SyncResult:
+        result = SyncResult()
         for raw in raw_devices:
             device_id = str(raw.get("device_id", "")).strip()
             device_type = str(raw.get("type", "")).strip()
             if not device_id or not device_type:
+                result.rejected += 1
                 continue
 
-            self.devices[device_id] = BridgeDevice(
+            state = raw.get("state", {}) if isinstance(raw.get("state", {}), dict) else {}
+            if device_type == "sensor":
+                throttle = raw.get("throttle")
+                state = self._throttle_sensor_state(device_id, state, throttle if isinstance(throttle, dict) else {})
+
+            device = BridgeDevice(
                 device_id=device_id,
                 name=str(raw.get("name", device_id)),
                 room=str(raw.get("room", "")),
                 device_type=device_type,
                 capabilities=_normalize_maybe_array(raw.get("capabilities", [])),
-                state=raw.get("state", {}) if isinstance(raw.get("state", {}), dict) else {},
+                state=state,
             )
-            accepted += 1
+            result.seen.add(device_id)
+            previous = self.devices.get(device_id)
+            if previous != device:
+                self.devices[device_id] = device
+                result.changed.add(device_id)
+                if previous is None or previous.device_type != device_type or _fields_grew(previous, device):
+                    self._index_device(device, previous, result)
+            result.accepted += 1
+
+        return result
+
+    def reconcile_snapshot(self, result: SyncResult) -> SyncResult:
+        """Age out devices missing from a full snapshot.
+
+        A device absent from one snapshot is marked unavailable; once it has
+        been absent from ``orphan_snapshots`` consecutive snapshots it is
+        dropped from the store and reported in ``result.removed``.
+        """
+        for device_id in self._missed_snapshots.keys() & result.seen:
+            del self._missed_snapshots[device_id]
+
+        for device_id in self.devices.keys() - result.seen:
+            missed = self._missed_snapshots.get(device_id, 0) + 1
+            if missed < self.orphan_snapshots:
+                self._missed_snapshots[device_id] = missed
+                device = self.devices[device_id]
+                if device.available:
+                    self.devices[device_id] = replace(device, available=False)
+                    result.changed.add(device_id)
+                continue
+
+            device = self.devices.pop(device_id)
+            self._missed_snapshots.pop(device_id, None)
+            self._sensor_published.pop(device_id, None)
+            self._held_sensors.discard(device_id)
+            self._buckets.pop(device_id, None)
+            if (deferred := self._deferred.pop(device_id, None)) is not None:
+                self.counters["commands_orphaned"] += len(deferred)
+            self.throttled_devices.pop(device_id, None)
+            self._last_sent.pop(device_id, None)
+            if (platform := DEVICE_TYPE_PLATFORMS.get(device.device_type)) is not None:
+                self.platform_devices.get(platform, set()).discard(device_id)
+            result.changed.discard(device_id)
+            result.removed.add(device_id)
+
+        return result
+
+    def is_unchanged_snapshot(self, snapshot_hash: str | None) -> bool:
+        """Return True (and count it) if a full snapshot matches the last one applied."""
+        if snapshot_hash and snapshot_hash == self._snapshot_hash:
+            self.counters["snapshot_unchanged"] += 1
+            return True
+        return False
+
+    def mark_snapshot_applied(self, result: SyncResult, partial: bool) -> None:
+        """Track whether the driver's deltas still add up to a trustworthy picture."""
+        if not partial:
+            self._needs_full_snapshot = False
+        elif result.rejected:
+            self._needs_full_snapshot = True
+
+    def pacing_hints(self) -> dict[str, Any]:
+        """Tell the driver how soon to poll and sync, and how much to fetch."""
+        queued = len(self._commands) + self._deferred_count()
+        idle_for = None if self._last_command_at is None else monotonic() - self._last_command_at
+
+        if queued:
+            next_poll_ms = PACING_BURST_POLL_MS
+        elif self.push_active:
+            next_poll_ms = PACING_PUSH_POLL_MS
+        elif idle_for is not None and idle_for < PACING_ACTIVE_WINDOW_SECONDS:
+            next_poll_ms = PACING_ACTIVE_POLL_MS
+        elif idle_for is not None and idle_for < PACING_IDLE_AFTER_SECONDS:
+            next_poll_ms = PACING_DEFAULT_POLL_MS
+        else:
+            next_poll_ms = PACING_IDLE_POLL_MS
+
+        return {
+            "next_poll_ms": next_poll_ms,
+            "next_sync_ms": PACING_IDLE_SYNC_MS if next_poll_ms == PACING_IDLE_POLL_MS else PACING_SYNC_MS,
+            "full_sync": self._needs_full_snapshot,
+            "batch_size": max(self.command_batch_size, min(MAX_COMMAND_BATCH_SIZE, queued)),
+        }
+
+    def remember_snapshot_hash(self, snapshot_hash: str | None) -> None:
+        """Record the hash of the snapshot just applied; None forgets it."""
+        # Devices inside their orphan grace period only age out, and held
+        # sensor readings are only published, when the next snapshot is
+        # actually applied; never short-circuit while either exists.
+        self._snapshot_hash = snapshot_hash if not (self._missed_snapshots or self._held_sensors) else None
+
+    def mark_contact(self) -> bool:
+        """Record a request from the driver; return True if it revives a stale bridge."""
+        self._last_contact = monotonic()
+        if self.bridge_online:
+            return False
+        self.bridge_online = True
+        return True
+
+    def check_liveness(self) -> bool:
+        """Mark the bridge stale after ``stale_after`` seconds of silence; return True on that change."""
+        if not self.bridge_online or monotonic() - self._last_contact < self.stale_after:
+            return False
+        self.bridge_online = False
+        self.counters["bridge_stale"] += 1
+        return True
+
+    def diagnostics(self) -> dict[str, Any]:
+        """Return a summary of store state for diagnostics."""
+        return {
+            "bridge_id": self.bridge_id,
+            "bridge_online": self.bridge_online,
+            "seconds_since_contact": round(monotonic() - self._last_contact, 1),
+            "devices": len(self.devices),
+            "platform_devices": {platform: len(ids) for platform, ids in self.platform_devices.items()},
+            "queued_commands": len(self._commands),
+            "deferred_commands": self._deferred_count(),
+            "throttled_devices": dict(self.throttled_devices.most_common(20)),
+            "inflight_commands": len(self._inflight),
+            "push_active": self.push_active,
+            "counters": dict(self.counters),
+            "actions": {action: _action_summary(stats) for action, stats in sorted(self.action_stats.items())},
+        }
+
+    def _index_device(self, device: BridgeDevice, previous: BridgeDevice | None, result: SyncResult) -> None:
+        """Track which platform owns a device and report it as new for that platform."""
+        if previous is not None and (old_platform := DEVICE_TYPE_PLATFORMS.get(previous.device_type)) is not None:
+            self.platform_devices.get(old_platform, set()).discard(device.device_id)
+
+        platform = DEVICE_TYPE_PLATFORMS.get(device.device_type)
+        if platform is None:
+            return
+        self.platform_devices.setdefault(platform, set()).add(device.device_id)
+        result.added.setdefault(platform, []).append(device.device_id)
+
+    def _throttle_sensor_state(
+        self, device_id: str, state: dict[str, Any], overrides: dict[str, Any]
+    ) -> dict[str, Any]:
+        """Hold back numeric readings that are inside their deadband and interval."""
+        now = monotonic()
+        published = self._sensor_published.setdefault(device_id, {})
+        throttled = dict(state)
+        held = False
+        for key, value in state.items():
+            if isinstance(value, bool) or not isinstance(value, (int, float)):
+                continue
+
+            deadband, min_interval = SENSOR_THROTTLE_DEFAULTS.get(key, DEFAULT_SENSOR_THROTTLE)
+            override = overrides.get(key)
+            if isinstance(override, dict):
+                try:
+                    deadband = float(override.get("deadband", deadband))
+                    min_interval = float(override.get("min_interval", min_interval))
+                except (TypeError, ValueError):
+                    pass
+
+            last = published.get(key)
+            if last is not None and abs(value - last[0]) < deadband and now - last[1] < min_interval:
+                throttled[key] = last[0]
+                held = True
+                continue
+            published[key] = (value, now)
 
-        return accepted
+        if held:
+            self._held_sensors.add(device_id)
+        else:
+            self._held_sensors.discard(device_id)
+        return throttled
 
-    def enqueue_command(self, device_id: str, action: str, params: dict[str, Any] | None = None) -> str:
+    def enqueue_command(
+        self, device_id: str, action: str, params: dict[str, Any] | None = None, ttl: float | None = None
+    ) -> str:
+        """Queue a command; ``ttl`` seconds overrides the action's default, 0 disables expiry."""
         command_id = f"cmd_{token_hex(6)}"
-        self._commands.append(
-            BridgeCommand(
-                command_id=command_id,
-                device_id=device_id,
-                action=action,
-                params=params or {},
-            )
+        now = self._last_command_at = monotonic()
+        if ttl is None:
+            ttl = self.command_ttls.get(action, 0)
+        command = BridgeCommand(
+            command_id=command_id,
+            device_id=device_id,
+            action=action,
+            params=params or {},
+            expires_at=now + ttl if ttl > 0 else None,
         )
+
+        # A device with a deferred command stays throttled until it is released,
+        # so a refilled token never lets a newer command overtake it.
+        deferred = self._deferred.get(device_id)
+        if self.command_rate and (deferred is not None or not self._take_token(device_id, now)):
+            self.counters["commands_throttled"] += 1
+            self.throttled_devices[device_id] += 1
+            key = _intent_key(device_id, action)
+            pending = self._latest_queued.get(key) or (deferred or {}).get(key[1])
+            if pending is not None:
+                _merge_intent(pending, command)
+                self.counters["commands_merged"] += 1
+                return pending.command_id
+            self._deferred.setdefault(device_id, {})[key[1]] = command
+            if self.on_command_deferred is not None:
+                self.on_command_deferred(self._refill_delay(device_id, now))
+            return command_id
+
+        self._queue(command)
         return command_id
 
+    def request_refresh(self, device_ids: Iterable[str]) -> str | None:
+        """Ask the driver to re-send the given devices as a partial sync.
+
+        Refreshes are bridge-level commands (empty device ID); a refresh that
+        has not been sent yet absorbs later requests.
+        """
+        wanted = {device_id for device_id in device_ids if device_id in self.devices}
+        if not wanted:
+            return None
+        pending = self._latest_queued.get(("", "refresh")) or self._deferred.get("", {}).get("refresh")
+        if pending is not None:
+            pending.params = {"device_ids": sorted(wanted.union(pending.params.get("device_ids", ())))}
+            return pending.command_id
+        return self.enqueue_command("", "refresh", {"device_ids": sorted(wanted)})
+
+    def _queue(self, command: BridgeCommand) -> None:
+        self._commands.append(command)
+        self._latest_queued[_intent_key(command.device_id, command.action)] = command
+        if self.on_command_enqueued is not None:
+            self.on_command_enqueued()
+
+    def _take_token(self, device_id: str, now: float) -> bool:
+        tokens, last = self._buckets.get(device_id, (self.command_burst, now))
+        tokens = min(self.command_burst, tokens + (now - last) * self.command_rate)
+        if tokens < 1:
+            self._buckets[device_id] = (tokens, now)
+            return False
+        self._buckets[device_id] = (tokens - 1, now)
+        return True
+
+    def _refill_delay(self, device_id: str, now: float) -> float:
+        tokens, last = self._buckets.get(device_id, (self.command_burst, now))
+        return max(0.0, (1 - tokens) / self.command_rate - (now - last))
+
+    def _deferred_count(self) -> int:
+        return sum(len(deferred) for deferred in self._deferred.values())
+
+    def _release_deferred(self, now: float) -> None:
+        """Queue deferred commands whose device has tokens again, oldest first."""
+        wake: float | None = None
+        for device_id in list(self._deferred):
+            deferred = self._deferred[device_id]
+            while deferred and self._take_token(device_id, now):
+                self._queue(deferred.pop(next(iter(deferred))))
+            if not deferred:
+                del self._deferred[device_id]
+                continue
+            delay = self._refill_delay(device_id, now)
+            wake = delay if wake is None else min(wake, delay)
+        if wake is not None and self.on_command_deferred is not None:
+            self.on_command_deferred(wake)
+
     def pop_commands(self, limit: int) -> list[BridgeCommand]:
         commands: list[BridgeCommand] = []
+        now = monotonic()
+        self._expire_inflight(now)
+        if self._deferred:
+            self._release_deferred(now)
         while self._commands and len(commands) < limit:
             command = self._commands.popleft()
+            key = _intent_key(command.device_id, command.action)
+            if self._latest_queued.get(key) is command:
+                del self._latest_queued[key]
+            if command.expires_at is not None and command.expires_at <= now:
+                self.counters["commands_expired"] += 1
+                continue
+            command.sent_at = now
+            command.attempts += 1
+            for device_id, intent in _sent_keys(command):
+                self._last_sent.setdefault(device_id, {})[intent] = command.command_id
             self._inflight[command.command_id] = command
             commands.append(command)
         return commands
 
-    def ack_commands(self, command_ids: list[str]) -> int:
-        acked = 0
+    def _expire_inflight(self, now: float) -> None:
+        """Redeliver or drop commands whose ack never came.
+
+        ``_inflight`` is ordered by send time, so only the timed-out head of
+        it is ever visited.
+        """
+        cutoff = now - INFLIGHT_TIMEOUT_SECONDS
+        redeliver: list[BridgeCommand] = []
+        while self._inflight:
+            command = next(iter(self._inflight.values()))
+            if command.sent_at > cutoff:
+                break
+            del self._inflight[command.command_id]
+            if self._is_superseded(command):
+                self.counters["commands_superseded"] += 1
+            elif command.attempts < MAX_COMMAND_ATTEMPTS and (command.expires_at is None or command.expires_at > now):
+                redeliver.append(command)
+                self.counters["commands_redelivered"] += 1
+            else:
+                self.counters["commands_unacked"] += 1
+        self._commands.extendleft(reversed(redeliver))
+
+    def _is_superseded(self, command: BridgeCommand) -> bool:
+        """Return True once a newer command of the same group was sent for all of its devices."""
+        return all(
+            self._last_sent.get(device_id, {}).get(intent) != command.command_id
+            for device_id, intent in _sent_keys(command)
+        )
+
+    def requeue_commands(self, command_ids: Iterable[str]) -> int:
+        """Return in-flight commands to the front of the queue, keeping their order.
+
+        A command is dropped instead when a newer one of its intent group has
+        been sent since (for a refresh: a newer refresh for each of its devices).
+        """
+        commands: list[BridgeCommand] = []
         for command_id in command_ids:
-            if self._inflight.pop(command_id, None) is not None:
-                acked += 1
-        return acked
+            if (command := self._inflight.pop(command_id, None)) is None:
+                continue
+            if self._is_superseded(command):
+                self.counters["commands_superseded"] += 1
+                continue
+            commands.append(command)
+        self._commands.extendleft(reversed(commands))
+        return len(commands)
+
+    def ack_commands(self, command_ids: list[str]) -> int:
+        """Complete in-flight commands the driver executed successfully."""
+        return self.apply_acks({"command_id": command_id} for command_id in command_ids).acked
+
+    def apply_acks(self, acks: Iterable[Any]) -> AckResult:
+        """Complete in-flight commands from the driver's acks.
+
+        An ack without a status counts as success. A failure the driver marks
+        ``retryable`` goes straight back to the head of the queue while the
+        command has attempts and TTL left. Any other failure is final: the
+        failed devices get a refresh, so their entities show the controller's
+        actual state within one round trip.
+        """
+        result = AckResult()
+        now = monotonic()
+        retry: list[BridgeCommand] = []
+        for ack in acks:
+            if not isinstance(ack, dict):
+                continue
+            command = self._inflight.pop(str(ack.get("command_id", "")).strip(), None)
+            if command is None:
+                continue
+            succeeded = ack.get("status", "success") == "success"
+            if not succeeded and self._is_superseded(command):
+                # A newer command of its group went out; it decides the outcome.
+                self.counters["commands_superseded"] += 1
+                continue
+            stats = self.action_stats.get(command.action)
+            if stats is None:
+                stats = self.action_stats[command.action] = Counter()
+            latency_ms = (now - command.sent_at) * 1000
+            stats["latency_ms_total"] += latency_ms
+            stats["latency_ms_max"] = max(stats["latency_ms_max"], latency_ms)
+
+            if succeeded:
+                stats["success"] += 1
+                result.acked += 1
+            elif (
+                ack.get("retryable") is True
+                and command.attempts < MAX_COMMAND_ATTEMPTS
+                and (command.expires_at is None or command.expires_at > now)
+            ):
+                stats["retried"] += 1
+                self.counters["commands_retried"] += 1
+                retry.append(command)
+            else:
+                stats["failed"] += 1
+                self.counters["commands_failed"] += 1
+                result.failed.append(command)
+                _LOGGER.warning(
+                    "Command %s on device %s failed after %d attempt(s): %s",
+                    command.action,
+                    command.device_id or "(bridge)",
+                    command.attempts,
+                    ack.get("message", ""),
+                )
+
+        if retry:
+            self._commands.extendleft(reversed(retry))
+            result.retried = len(retry)
+            if self.on_command_enqueued is not None:
+                self.on_command_enqueued()
+        # A failed refresh is not refreshed again.
+        if refresh := [command.device_id for command in result.failed if command.action != "refresh"]:
+            self.request_refresh(refresh)
+        return result
+
@@ -0,0 +1,44 @@
+"""Helpers shared by the developer tools in this directory."""
+
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+
+# Commands the tools enqueue, per device type, as the entities would.
+COMMANDS = {
+    "light": [("turn_on", {"brightness": 50}), ("turn_off", {})],
+    "lock": [("lock", {}), ("unlock", {})],
+    "cover": [("open", {}), ("close", {}), ("stop", {}), ("set_position", {"position": 40})],
+    "thermostat": [("set_hvac_mode", {"mode": "Heat"}), ("set_setpoints", {"heat_setpoint": 70})],
+}
+
+
+def add_repo_to_path() -> None:
+    """Make ``custom_components`` importable when a tool is run from a checkout."""
+    if str(REPO_ROOT) not in sys.path:
+        sys.path.insert(0, str(REPO_ROOT))
+
+
+class SimulatedClock:
+    """Stands in for ``time.monotonic`` inside the store module."""
+
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def percentiles(values: list[float], scale: float = 1.0) -> dict[str, float]:
+    """Return p50/p95/p99/max of ``values``, each multiplied by ``scale``."""
+    if not values:
+        return {}
+    ordered = sorted(values)
+
+    def pick(quantile: float) -> float:
+        return ordered[min(len(ordered) - 1, int(quantile * len(ordered)))] * scale
+
+    return {"p50": pick(0.50), "p95": pick(0.95), "p99": pick(0.99), "max": ordered[-1] * scale}
@@ -0,0 +1,132 @@
+"""Stand-in for the integration's HTTP views, backed by the real BridgeStore.
+
+Used by the developer tools in this directory when no Home Assistant instance
+is available. Requests go through the same handlers as the integration's views
+(``protocol.py``); only the entity and device registry work is skipped, so it
+measures the driver side, the protocol handling and the store.
+Requires the ``homeassistant`` package, which the integration imports.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Callable
+from time import monotonic
+from typing import Any
+
+from aiohttp import web
+
+from _common import add_repo_to_path
+
+add_repo_to_path()
+
+from custom_components.control4_bridge.const import (  # noqa: E402
+    API_ACK_PATH,
+    API_COMMANDS_PATH,
+    API_EVENT_PATH,
+    API_SYNC_PATH,
+    DEFAULT_SYNC_CHUNK_SIZE,
+    HEADER_SECRET,
+)
+from custom_components.control4_bridge.metrics import StageTimer  # noqa: E402
+from custom_components.control4_bridge.models import SyncResult  # noqa: E402
+from custom_components.control4_bridge.protocol import (  # noqa: E402
+    Response,
+    async_handle_sync,
+    handle_ack,
+    handle_commands,
+    handle_events,
+)
+from custom_components.control4_bridge.store import BridgeStore  # noqa: E402
+
+
+class StandInServer:
+    """aiohttp server exposing sync, commands, ack and event for one BridgeStore."""
+
+    def __init__(self, bridge_id: str, shared_secret: str, store: BridgeStore | None = None) -> None:
+        self.store = store or BridgeStore(bridge_id)
+        self.shared_secret = shared_secret
+        # command_id -> monotonic enqueue time, for end-to-end latency
+        self.enqueued_at: dict[str, float] = {}
+        self.command_latencies: list[float] = []
+        # Called with every SyncResult, where the views would publish to HA.
+        self.on_sync_result: Callable[[SyncResult], None] | None = None
+        self._sync_lock = asyncio.Lock()
+        self._runner: web.AppRunner | None = None
+
+    def enqueue_command(self, device_id: str, action: str, params: dict[str, Any] | None = None) -> str:
+        command_id = self.store.enqueue_command(device_id, action, params)
+        # Throttled commands merge into a pending one and share its ID.
+        self.enqueued_at.setdefault(command_id, monotonic())
+        return command_id
+
+    def make_app(self) -> web.Application:
+        app = web.Application()
+        app.router.add_post(API_SYNC_PATH, self._sync)
+        app.router.add_get(API_COMMANDS_PATH, self._commands)
+        app.router.add_post(API_ACK_PATH, self._ack)
+        app.router.add_post(API_EVENT_PATH, self._event)
+        return app
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> str:
+        """Start listening and return the base URL."""
+        self._runner = web.AppRunner(self.make_app(), access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, host, port)
+        await site.start()
+        bound_port = site._server.sockets[0].getsockname()[1]
+        return f"http://{host}:{bound_port}"
+
+    async def stop(self) -> None:
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    def _authorized(self, request: web.Request) -> bool:
+        provided = request.headers.get(HEADER_SECRET, "")
+        return bool(provided) and provided == self.shared_secret
+
+    def _record_latencies(self, command_ids: list[Any]) -> None:
+        now = monotonic()
+        for command_id in command_ids:
+            if command_id in self.store._inflight and command_id in self.enqueued_at:
+                self.command_latencies.append(now - self.enqueued_at.pop(command_id))
+
+    def _respond(self, response: Response) -> web.Response:
+        payload, status = response
+        return web.json_response(payload, status=status)
+
+    async def _sync(self, request: web.Request) -> web.Response:
+        if not self._authorized(request):
+            return web.json_response({"ok": False, "error": "unauthorized"}, status=401)
+        return self._respond(
+            await async_handle_sync(
+                self.store, request.headers, request.json, self._sync_lock, DEFAULT_SYNC_CHUNK_SIZE,
+                self._publish, StageTimer(),
+            )
+        )
+
+    def _publish(self, result: SyncResult) -> None:
+        if self.on_sync_result is not None:
+            self.on_sync_result(result)
+
+    async def _commands(self, request: web.Request) -> web.Response:
+        if not self._authorized(request):
+            return web.json_response({"ok": False, "error": "unauthorized"}, status=401)
+        self._record_latencies(request.query.get("ack", "").split(","))
+        return self._respond(handle_commands(self.store, request.query, StageTimer()))
+
+    async def _ack(self, request: web.Request) -> web.Response:
+        if not self._authorized(request):
+            return web.json_response({"ok": False, "error": "unauthorized"}, status=401)
+        body = await request.json()
+        acks = body.get("acks")
+        if isinstance(acks, list):
+            self._record_latencies([ack.get("command_id") for ack in acks if isinstance(ack, dict)])
+        return self._respond(handle_ack(self.store, body, StageTimer()))
+
+    async def _event(self, request: web.Request) -> web.Response:
+        if not self._authorized(request):
+            return web.json_response({"ok": False, "error": "unauthorized"}, status=401)
+        # No entities here; matched events are only counted.
+        return self._respond(handle_events(self.store, await request.json(), lambda *event: None, StageTimer()))
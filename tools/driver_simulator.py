@@ -0,0 +1,399 @@
+"""Simulate the Control4 driver and load-test the bridge protocol.
+
+Emulates driver.lua: full syncs with the devices hash, debounced partial
+pushes of changed devices, command polling with piggybacked acks, command
+execution with duplicate suppression, pacing hints, a two-request in-flight
+cap and exponential backoff with jitter. Runs against a real Home Assistant
+(``--url``) or, by default, a local stand-in server around BridgeStore that
+also generates commands so end-to-end latency can be measured.
+
+Examples:
+    python tools/driver_simulator.py --devices 500 --change-rate 50 --command-rate 5
+    python tools/driver_simulator.py --url http://ha.local:8123 --secret s3cret --devices 2000
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import hashlib
+import json
+import random
+from collections import Counter, OrderedDict, defaultdict
+from datetime import UTC, datetime
+from time import monotonic
+from typing import Any
+
+import aiohttp
+
+from _common import percentiles
+from bridge_standin import StandInServer
+
+CHANGE_DEBOUNCE_MS = 75
+MAX_REQUESTS_IN_FLIGHT = 2
+BACKOFF_BASE_MS = 1000
+BACKOFF_MAX_MS = 60000
+EXECUTED_COMMAND_HISTORY = 512
+MAX_PIGGYBACK_ACKS = 50
+
+# Device type -> (capabilities, default state)
+DEVICE_TEMPLATES: dict[str, tuple[list[str], dict[str, Any]]] = {
+    "light": (["on_off", "brightness"], {"on": False, "brightness": 0}),
+    "lock": (["lock"], {"lock_status": "locked"}),
+    "cover": (["open_close", "stop", "position"], {"position": 0, "status": "closed"}),
+    "thermostat": (
+        ["setpoint_heat", "setpoint_cool", "fan_mode"],
+        {"hvac_mode": "Heat", "fan_mode": "Auto", "scale": "F", "heat_setpoint": 68, "current_temperature": 67},
+    ),
+}
+
+
+def _mutate_state(device_type: str, state: dict[str, Any]) -> None:
+    """Apply a random physical change, as a keypad or sensor would."""
+    if device_type == "light":
+        state["brightness"] = random.choice([0, 25, 50, 75, 100])
+        state["on"] = state["brightness"] > 0
+    elif device_type == "lock":
+        state["lock_status"] = random.choice(["locked", "unlocked"])
+    elif device_type == "cover":
+        state["position"] = random.randint(0, 100)
+        state["status"] = "closed" if state["position"] == 0 else "open"
+    else:
+        state["current_temperature"] = round(random.uniform(62, 78), 1)
+
+
+def _random_command(device_type: str) -> tuple[str, dict[str, Any]]:
+    if device_type == "light":
+        return "turn_on", {"brightness": random.randint(1, 100)}
+    if device_type == "lock":
+        return random.choice(["lock", "unlock"]), {}
+    if device_type == "cover":
+        return "set_position", {"position": random.randint(0, 100)}
+    return "set_setpoints", {"heat_setpoint": random.randint(60, 72), "scale": "F"}
+
+
+def _execute(device_type: str, state: dict[str, Any], action: str, params: dict[str, Any]) -> bool:
+    """Apply a command the way driver.lua's handlers update cached state."""
+    if device_type == "light" and action in ("turn_on", "turn_off"):
+        level = 0 if action == "turn_off" else int(params.get("brightness", 100))
+        state.update(on=level > 0, brightness=level)
+    elif device_type == "lock" and action in ("lock", "unlock"):
+        state["lock_status"] = "locked" if action == "lock" else "unlocked"
+    elif device_type == "cover" and action in ("open", "close", "set_position"):
+        position = {"open": 100, "close": 0}.get(action, params.get("position", 0))
+        state.update(position=position, status="closed" if position == 0 else "open")
+    elif device_type == "thermostat" and action == "set_setpoints":
+        state.update({key: params[key] for key in ("heat_setpoint", "cool_setpoint") if key in params})
+    else:
+        return False
+    return True
+
+
+class SimulatedDriver:
+    """One emulated bridge driver talking HTTP to HA or the stand-in."""
+
+    def __init__(self, args: argparse.Namespace, base_url: str) -> None:
+        self.args = args
+        self.base_url = base_url.rstrip("/")
+        types = list(DEVICE_TEMPLATES)
+        self.devices: dict[str, dict[str, Any]] = {}
+        for index in range(args.devices):
+            device_type = types[index % len(types)]
+            device_id = str(1000 + index)
+            capabilities, state = DEVICE_TEMPLATES[device_type]
+            self.devices[device_id] = {
+                "device_id": device_id,
+                "name": f"Sim {device_type.title()} {device_id}",
+                "room": f"Room {index // 20}",
+                "type": device_type,
+                "capabilities": capabilities,
+                "state": dict(state),
+            }
+        self.fragments: dict[str, str] = {}
+        self.pending_changes: set[str] = set()
+        self.ack_buffer: list[dict[str, Any]] = []
+        self.executed: OrderedDict[str, dict[str, Any]] = OrderedDict()
+        self.poll_interval = args.poll_interval / 1000
+        self.sync_interval = args.sync_interval / 1000
+        self.batch_size = 25
+        self.full_sync_requested = True
+
+        self.http_latency: dict[str, list[float]] = defaultdict(list)
+        self.command_latency: list[float] = []
+        self.counts: Counter[str] = Counter()
+        self._semaphore = asyncio.Semaphore(MAX_REQUESTS_IN_FLIGHT)
+        self._failures = 0
+        self._backoff_until = 0.0
+        self._flush_scheduled = False
+        self._session: aiohttp.ClientSession | None = None
+
+    # --- serialization, mirroring the per-device fragment cache in driver.lua
+
+    def _fragment(self, device_id: str) -> str:
+        if device_id not in self.fragments:
+            self.fragments[device_id] = json.dumps(self.devices[device_id], separators=(",", ":"))
+        return self.fragments[device_id]
+
+    def _body(self, fragments: list[str], partial: bool) -> str:
+        envelope = {
+            "protocol_version": 1,
+            "bridge_id": self.args.bridge_id,
+            "timestamp": datetime.now(UTC).strftime("%Y-%m-%dT%H:%M:%SZ"),
+        }
+        if partial:
+            envelope["partial"] = True
+        return json.dumps(envelope)[:-1] + ',"devices":[' + ",".join(fragments) + "]}"
+
+    def mark_changed(self, device_id: str) -> None:
+        self.fragments.pop(device_id, None)
+        self.pending_changes.add(device_id)
+        self.counts["device_changes"] += 1
+        if not self._flush_scheduled:
+            self._flush_scheduled = True
+            asyncio.get_running_loop().call_later(
+                CHANGE_DEBOUNCE_MS / 1000, lambda: asyncio.ensure_future(self.flush_changes())
+            )
+
+    # --- HTTP with in-flight cap, backoff and failure injection
+
+    async def _request(self, endpoint: str, method: str, url: str, body: str | None = None, headers=None):
+        async with self._semaphore:
+            delay = self._backoff_until - monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            if self.args.latency:
+                await asyncio.sleep(self.args.latency / 1000)
+
+            self.counts[f"{endpoint}_requests"] += 1
+            started = monotonic()
+            status, payload = 0, None
+            if random.random() < self.args.failure_rate:
+                self.counts[f"{endpoint}_injected_failures"] += 1
+            else:
+                request_headers = {"Content-Type": "application/json", "X-C4-Bridge-Secret": self.args.secret}
+                request_headers.update(headers or {})
+                try:
+                    async with self._session.request(method, url, data=body, headers=request_headers) as response:
+                        status = response.status
+                        payload = await response.json(content_type=None)
+                except (aiohttp.ClientError, asyncio.TimeoutError, ValueError):
+                    status = 0
+            self.http_latency[endpoint].append(monotonic() - started)
+
+            if 200 <= status < 300:
+                self._failures = 0
+                return payload
+            self.counts[f"{endpoint}_errors"] += 1
+            self._failures += 1
+            backoff = min(BACKOFF_MAX_MS, BACKOFF_BASE_MS * 2 ** (self._failures - 1))
+            self._backoff_until = monotonic() + (backoff / 2 + random.random() * backoff / 2) / 1000
+            return None
+
+    def _apply_pacing(self, payload: dict[str, Any] | None) -> None:
+        pacing = (payload or {}).get("pacing")
+        if self.args.ignore_pacing or not isinstance(pacing, dict):
+            return
+        self.poll_interval = max(0.2, min(60.0, pacing.get("next_poll_ms", self.poll_interval * 1000) / 1000))
+        self.sync_interval = max(5.0, min(300.0, pacing.get("next_sync_ms", self.sync_interval * 1000) / 1000))
+        self.batch_size = max(1, min(100, int(pacing.get("batch_size", self.batch_size))))
+        if pacing.get("full_sync"):
+            self.full_sync_requested = True
+
+    # --- driver loops
+
+    async def full_sync(self) -> None:
+        self.full_sync_requested = False
+        fragments = [self._fragment(device_id) for device_id in self.devices]
+        devices_json = "[" + ",".join(fragments) + "]"
+        headers = {
+            "X-C4-Bridge-Id": self.args.bridge_id,
+            "X-C4-Devices-Hash": hashlib.sha256(devices_json.encode()).hexdigest(),
+        }
+        payload = await self._request(
+            "sync", "POST", f"{self.base_url}/api/control4_bridge/sync", self._body(fragments, False), headers
+        )
+        if payload and payload.get("unchanged"):
+            self.counts["sync_unchanged"] += 1
+        self._apply_pacing(payload)
+
+    async def flush_changes(self) -> None:
+        self._flush_scheduled = False
+        changed, self.pending_changes = self.pending_changes, set()
+        if not changed:
+            return
+        body = self._body([self._fragment(device_id) for device_id in changed], True)
+        self.counts["pushed_devices"] += len(changed)
+        self._apply_pacing(await self._request("push", "POST", f"{self.base_url}/api/control4_bridge/sync", body))
+
+    async def poll(self) -> None:
+        sent = [ack for ack in self.ack_buffer if ack["status"] == "success"][:MAX_PIGGYBACK_ACKS]
+        url = f"{self.base_url}/api/control4_bridge/commands?bridge_id={self.args.bridge_id}&limit={self.batch_size}"
+        if sent:
+            url += "&ack=" + ",".join(ack["command_id"] for ack in sent)
+        payload = await self._request("poll", "GET", url)
+        if payload is None:
+            return
+        self.ack_buffer = [ack for ack in self.ack_buffer if ack not in sent]
+        self._apply_pacing(payload)
+
+        for command in payload.get("commands", []):
+            self._execute_command(command)
+        if any(ack["status"] != "success" for ack in self.ack_buffer):
+            acks, self.ack_buffer = self.ack_buffer, []
+            body = json.dumps({"bridge_id": self.args.bridge_id, "acks": acks})
+            if await self._request("ack", "POST", f"{self.base_url}/api/control4_bridge/ack", body) is None:
+                self.ack_buffer = acks + self.ack_buffer
+
+    def _execute_command(self, command: dict[str, Any]) -> None:
+        command_id = str(command.get("command_id", ""))
+        if command_id in self.executed:
+            self.counts["commands_duplicate"] += 1
+            if self.executed[command_id] not in self.ack_buffer:
+                self.ack_buffer.append(self.executed[command_id])
+            return
+
+        device = self.devices.get(str(command.get("device_id", "")))
+        ok = device is not None and _execute(
+            device["type"], device["state"], str(command.get("action", "")), command.get("params") or {}
+        )
+        if ok:
+            self.mark_changed(device["device_id"])
+        self.counts["commands_ok" if ok else "commands_failed"] += 1
+
+        # Against real HA, end-to-end latency is measured from created_at.
+        if not self.args.standin:
+            try:
+                created = datetime.fromisoformat(command["created_at"])
+                self.command_latency.append((datetime.now(UTC) - created).total_seconds())
+            except (KeyError, TypeError, ValueError):
+                pass
+
+        ack = {"command_id": command_id, "status": "success" if ok else "error", "message": "simulated"}
+        self.executed[command_id] = ack
+        if len(self.executed) > EXECUTED_COMMAND_HISTORY:
+            self.executed.popitem(last=False)
+        self.ack_buffer.append(ack)
+
+    async def poll_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.poll_interval)
+            await self.poll()
+            if self.full_sync_requested:
+                asyncio.ensure_future(self.full_sync())
+
+    async def sync_loop(self) -> None:
+        while True:
+            await self.full_sync()
+            await asyncio.sleep(self.sync_interval)
+
+    async def change_loop(self) -> None:
+        if self.args.change_rate <= 0:
+            return
+        device_ids = list(self.devices)
+        while True:
+            await asyncio.sleep(random.expovariate(self.args.change_rate))
+            device_id = random.choice(device_ids)
+            _mutate_state(self.devices[device_id]["type"], self.devices[device_id]["state"])
+            self.mark_changed(device_id)
+
+    async def run(self) -> None:
+        timeout = aiohttp.ClientTimeout(total=30)
+        async with aiohttp.ClientSession(timeout=timeout) as self._session:
+            tasks = [asyncio.ensure_future(loop()) for loop in (self.sync_loop, self.poll_loop, self.change_loop)]
+            try:
+                await asyncio.sleep(self.args.duration)
+            finally:
+                for task in tasks:
+                    task.cancel()
+                await asyncio.gather(*tasks, return_exceptions=True)
+
+
+async def _command_loop(server: StandInServer, driver: SimulatedDriver, rate: float) -> None:
+    device_ids = list(driver.devices)
+    while True:
+        await asyncio.sleep(random.expovariate(rate))
+        device_id = random.choice(device_ids)
+        action, params = _random_command(driver.devices[device_id]["type"])
+        server.enqueue_command(device_id, action, params)
+
+
+def _report(args: argparse.Namespace, driver: SimulatedDriver, server: StandInServer | None) -> dict[str, Any]:
+    latencies = server.command_latencies if server is not None else driver.command_latency
+    requests = sum(count for key, count in driver.counts.items() if key.endswith("_requests"))
+    # Injected failures are also counted as errors by _request.
+    errors = sum(count for key, count in driver.counts.items() if key.endswith("_errors"))
+    report = {
+        "duration_s": args.duration,
+        "devices": args.devices,
+        "requests": requests,
+        "requests_per_s": round(requests / args.duration, 2),
+        "error_rate": round(errors / requests, 4) if requests else 0.0,
+        "device_changes_per_s": round(driver.counts["device_changes"] / args.duration, 2),
+        "http_latency_ms": {endpoint: percentiles(values, 1000) for endpoint, values in driver.http_latency.items()},
+        "command_latency_ms": percentiles(latencies, 1000),
+        "commands_acked": len(latencies) if server is not None else driver.counts["commands_ok"],
+        "counts": dict(driver.counts),
+    }
+    if server is not None:
+        report["store"] = server.store.diagnostics()
+    return report
+
+
+async def _main(args: argparse.Namespace) -> dict[str, Any]:
+    server = None
+    base_url = args.url
+    if args.standin:
+        server = StandInServer(args.bridge_id, args.secret)
+        base_url = await server.start()
+
+    driver = SimulatedDriver(args, base_url)
+    command_task = None
+    if server is not None and args.command_rate > 0:
+        command_task = asyncio.ensure_future(_command_loop(server, driver, args.command_rate))
+    try:
+        await driver.run()
+    finally:
+        if command_task is not None:
+            command_task.cancel()
+        if server is not None:
+            await server.stop()
+    return _report(args, driver, server)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url", help="Home Assistant base URL; omit to use the local stand-in server")
+    parser.add_argument("--secret", default="simulator", help="shared secret configured in the integration")
+    parser.add_argument("--bridge-id", default="main_house")
+    parser.add_argument("--devices", type=int, default=200, help="number of exported devices")
+    parser.add_argument("--change-rate", type=float, default=5.0, help="device state changes per second")
+    parser.add_argument("--command-rate", type=float, default=1.0, help="stand-in only: commands per second")
+    parser.add_argument("--poll-interval", type=int, default=2000, help="initial poll interval (ms)")
+    parser.add_argument("--sync-interval", type=int, default=15000, help="initial full sync interval (ms)")
+    parser.add_argument("--ignore-pacing", action="store_true", help="keep the initial intervals")
+    parser.add_argument("--latency", type=int, default=0, help="added delay before each request (ms)")
+    parser.add_argument("--failure-rate", type=float, default=0.0, help="fraction of requests dropped (0-1)")
+    parser.add_argument("--duration", type=float, default=60.0, help="run time (s)")
+    parser.add_argument("--seed", type=int, help="random seed for repeatable runs")
+    parser.add_argument("--json", action="store_true", help="print the report as JSON")
+    args = parser.parse_args()
+    args.standin = args.url is None
+    if args.seed is not None:
+        random.seed(args.seed)
+
+    report = asyncio.run(_main(args))
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return
+    print(f"{report['requests']} requests in {args.duration:.0f}s ({report['requests_per_s']}/s), "
+          f"error rate {report['error_rate']:.2%}, {report['device_changes_per_s']} device changes/s")
+    for endpoint, stats in sorted(report["http_latency_ms"].items()):
+        print(f"  {endpoint:<5} " + "  ".join(f"{key} {value:.1f}ms" for key, value in stats.items()))
+    command_stats = report["command_latency_ms"]
+    print(f"commands acked: {report['commands_acked']}  end-to-end "
+          + ("  ".join(f"{key} {value:.1f}ms" for key, value in command_stats.items()) or "n/a"))
+    print("counts: " + ", ".join(f"{key}={value}" for key, value in sorted(report["counts"].items())))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+"""Replay a bridge traffic capture as a repeatable benchmark.
+
+Reads the JSON lines file written by the integration's ``capture_traffic``
+option and sends every request again, either to the local stand-in server
+around BridgeStore (default) or to a running Home Assistant (``--url``).
+Requests keep their original spacing, scaled by ``--speed``; ``--speed 0``
+sends them back to back. Commands handed out in the original session are not
+recreated, so polls replay against an empty queue.
+
+Examples:
+    python tools/replay_capture.py control4_bridge_capture.jsonl --speed 10
+    python tools/replay_capture.py capture.jsonl --url http://ha.local:8123 --secret s3cret
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+from collections import Counter, defaultdict
+from time import monotonic
+from typing import Any
+from urllib.parse import urlencode
+
+import aiohttp
+
+from _common import percentiles
+from bridge_standin import StandInServer
+
+PATHS = {
+    "sync": "/api/control4_bridge/sync",
+    "commands": "/api/control4_bridge/commands",
+    "ack": "/api/control4_bridge/ack",
+    "event": "/api/control4_bridge/event",
+}
+
+
+def load_capture(path: str) -> list[dict[str, Any]]:
+    with open(path, encoding="utf-8") as capture_file:
+        records = [json.loads(line) for line in capture_file if line.strip()]
+    return sorted(records, key=lambda record: record["t"])
+
+
+def _bridge_id(records: list[dict[str, Any]]) -> str:
+    for record in records:
+        if bridge_id := record["query"].get("bridge_id"):
+            return bridge_id
+        if record["body"]:
+            try:
+                return json.loads(record["body"])["bridge_id"]
+            except (ValueError, KeyError):
+                continue
+    return "main_house"
+
+
+async def replay(
+    records: list[dict[str, Any]], base_url: str, secret: str, speed: float
+) -> tuple[dict[str, list[float]], Counter[str]]:
+    latencies: dict[str, list[float]] = defaultdict(list)
+    counts: Counter[str] = Counter()
+
+    async def send(session: aiohttp.ClientSession, record: dict[str, Any]) -> None:
+        kind = record["kind"]
+        url = base_url + PATHS[kind]
+        if record["query"]:
+            url += "?" + urlencode(record["query"])
+        headers = {"Content-Type": "application/json", "X-C4-Bridge-Secret": secret, **record["headers"]}
+        started = monotonic()
+        try:
+            async with session.request(record["method"], url, data=record["body"], headers=headers) as response:
+                await response.read()
+                status = response.status
+        except aiohttp.ClientError:
+            status = 0
+        latencies[kind].append((monotonic() - started) * 1000)
+        counts[f"{kind}_requests"] += 1
+        if status != record["status"]:
+            counts[f"{kind}_status_mismatch"] += 1
+
+    async with aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=30)) as session:
+        tasks = []
+        start = monotonic()
+        origin = records[0]["t"] if records else 0.0
+        for record in records:
+            if speed > 0:
+                delay = (record["t"] - origin) / speed - (monotonic() - start)
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                tasks.append(asyncio.ensure_future(send(session, record)))
+            else:
+                await send(session, record)
+        await asyncio.gather(*tasks)
+    counts["wall_ms"] = round((monotonic() - start) * 1000)
+    return latencies, counts
+
+
+async def _main(args: argparse.Namespace) -> dict[str, Any]:
+    records = load_capture(args.capture)
+    server = None
+    base_url = args.url
+    if base_url is None:
+        server = StandInServer(_bridge_id(records), args.secret)
+        base_url = await server.start()
+    try:
+        latencies, counts = await replay(records, base_url.rstrip("/"), args.secret, args.speed)
+    finally:
+        if server is not None:
+            await server.stop()
+
+    original: dict[str, list[float]] = defaultdict(list)
+    for record in records:
+        original[record["kind"]].append(record["ms"])
+    report: dict[str, Any] = {
+        "records": len(records),
+        "captured_span_s": round(records[-1]["t"] - records[0]["t"], 3) if records else 0.0,
+        "speed": args.speed,
+        "latency_ms": {kind: percentiles(values) for kind, values in latencies.items()},
+        "captured_handler_ms": {kind: percentiles(values) for kind, values in original.items()},
+        "counts": dict(counts),
+    }
+    if server is not None:
+        report["store"] = server.store.diagnostics()
+    return report
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("capture", help="capture file written by the capture_traffic option")
+    parser.add_argument("--url", help="Home Assistant base URL; omit to use the local stand-in server")
+    parser.add_argument("--secret", default="replay", help="shared secret of the target (never stored in captures)")
+    parser.add_argument("--speed", type=float, default=1.0, help="time scale; 10 = ten times faster, 0 = no gaps")
+    args = parser.parse_args()
+
+    print(json.dumps(asyncio.run(_main(args)), indent=2))
+
+
+if __name__ == "__main__":
+    main()
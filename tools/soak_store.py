@@ -0,0 +1,291 @@
+"""Soak-test the integration's views, platforms and store for retained memory growth.
+
+Runs a long sequence of simulated cycles against a test Home Assistant
+instance with the integration set up: partial syncs of a few devices,
+periodic full snapshots with device churn, commands enqueued the way the
+entities queue them, polls that pop them and acks that are randomly lost.
+Every sync, poll and ack goes through the real HTTP views, so entities are
+added and removed by ``async_setup_platform_entities`` and the device
+registry cleanup, exactly as on a live install. Store time is simulated, so
+ack timeouts, command TTLs and rate limits play out as they would over hours
+of uptime.
+
+After a warm-up, tracemalloc snapshots and the live object count are sampled
+along with the size of every store container, the platforms' entity dicts,
+the entity and device registries and the state machine. The run fails (exit
+code 1) when memory allocated by the integration's own modules grows past
+``--max-growth-kb`` or any of those containers keeps growing. Total traced
+memory is reported too, but Home Assistant's own caches (entity id lru
+caches, registry tombstones) grow with churned ids and are not bounded here.
+
+Requires ``pytest-homeassistant-custom-component``, which provides the test
+Home Assistant instance.
+
+Examples:
+    python tools/soak_store.py --cycles 100000
+    python tools/soak_store.py --cycles 50000 --devices 2000 --ack-loss 0.2
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import gc
+import json
+import random
+import sys
+import tracemalloc
+from pathlib import Path
+from typing import Any
+
+import aiohttp
+from aiohttp.test_utils import TestServer
+
+# homeassistant.loader cannot be imported before homeassistant.core (import cycle).
+from homeassistant.core import HomeAssistant
+from homeassistant import loader
+from homeassistant.helpers import device_registry as dr, entity_registry as er
+from homeassistant.setup import async_setup_component
+from pytest_homeassistant_custom_component.common import MockConfigEntry, async_test_home_assistant
+
+from _common import COMMANDS, SimulatedClock, add_repo_to_path
+
+add_repo_to_path()
+
+
+from custom_components.control4_bridge import store as store_module  # noqa: E402
+from custom_components.control4_bridge.const import (  # noqa: E402
+    API_ACK_PATH,
+    API_COMMANDS_PATH,
+    API_SYNC_PATH,
+    DOMAIN,
+)
+from custom_components.control4_bridge.store import BridgeStore  # noqa: E402
+
+SECRET = "soak"
+BRIDGE_ID = "soak"
+SIMULATED_SECONDS_PER_CYCLE = 0.1
+INTEGRATION_FILTER = tracemalloc.Filter(True, str(Path(store_module.__file__).resolve().parent / "*"))
+
+
+class Soak:
+    """One soak run: a test HA instance, its bridge store and the device population."""
+
+    def __init__(
+        self, args: argparse.Namespace, hass: HomeAssistant, session: aiohttp.ClientSession, base_url: str
+    ) -> None:
+        self.args = args
+        self.hass = hass
+        self.session = session
+        self.base_url = base_url
+        self.store: BridgeStore = hass.data[DOMAIN]["store"]
+        self.entry_id: str = hass.data[DOMAIN]["entry_id"]
+        self.tombstones_dropped = 0
+        self.next_device = 0
+        self.devices: dict[str, dict[str, Any]] = {}
+        for _ in range(args.devices):
+            self._new_device()
+
+    def _new_device(self) -> None:
+        device_id = str(self.next_device)
+        self.next_device += 1
+        device_type = random.choice(list(COMMANDS))
+        self.devices[device_id] = {
+            "device_id": device_id,
+            "name": f"Soak {device_type} {device_id}",
+            "room": "Soak",
+            "type": device_type,
+            "capabilities": [],
+            "state": {"level": 0},
+        }
+
+    def _churn(self) -> None:
+        for device_id in random.sample(list(self.devices), int(len(self.devices) * self.args.churn)):
+            del self.devices[device_id]
+            self._new_device()
+
+    async def cycle(self, index: int) -> None:
+        store = self.store
+        full = index % self.args.full_sync_every == 0
+        if full:
+            self._churn()
+            records = list(self.devices.values())
+        else:
+            records = [self.devices[device_id] for device_id in random.sample(list(self.devices), 3)]
+        for record in records:
+            record["state"] = {"level": random.randrange(100)}
+        await self._http(API_SYNC_PATH, {"protocol_version": 1, "bridge_id": BRIDGE_ID,
+                                         "partial": not full, "devices": records})
+        if full:
+            # Let platform loads, entity adds and registry removals finish.
+            await self.hass.async_block_till_done()
+
+        # Entities queue commands straight into the store; only the driver
+        # side of the command loop goes over HTTP.
+        for _ in range(random.randint(0, 3)):
+            device_id = random.choice(list(self.devices))
+            action, params = random.choice(COMMANDS[self.devices[device_id]["type"]])
+            store.enqueue_command(device_id, action, dict(params))
+
+        polled = await self._http(f"{API_COMMANDS_PATH}?bridge_id={BRIDGE_ID}", None)
+        acked = [command["command_id"] for command in polled["commands"] if random.random() >= self.args.ack_loss]
+        await self._http(API_ACK_PATH, {"bridge_id": BRIDGE_ID,
+                                        "acks": [{"command_id": cid, "status": "success"} for cid in acked]})
+
+    async def _http(self, path: str, body: dict[str, Any] | None) -> dict[str, Any]:
+        headers = {"X-C4-Bridge-Secret": SECRET}
+        method = "GET" if body is None else "POST"
+        async with self.session.request(method, self.base_url + path, json=body, headers=headers) as response:
+            return await response.json()
+
+    def sizes(self) -> dict[str, int]:
+        store = self.store
+        hass = self.hass
+        entities = hass.data[DOMAIN]["entities"]
+        return {
+            "devices": len(store.devices),
+            "platform_devices": sum(len(ids) for ids in store.platform_devices.values()),
+            "entity_devices": sum(len(devices) for devices in entities.values()),
+            "entities": sum(len(by_id) for devices in entities.values() for by_id in devices.values()),
+            "entity_registry": len(er.async_entries_for_config_entry(er.async_get(hass), self.entry_id)),
+            "device_registry": len(dr.async_entries_for_config_entry(dr.async_get(hass), self.entry_id)),
+            "states": len(hass.states.async_entity_ids()),
+            "queued": len(store._commands),
+            "inflight": len(store._inflight),
+            "deferred": sum(len(deferred) for deferred in store._deferred.values()),
+            "latest_queued": len(store._latest_queued),
+            "buckets": len(store._buckets),
+            "throttled_devices": len(store.throttled_devices),
+            "last_sent": len(store._last_sent),
+            "missed_snapshots": len(store._missed_snapshots),
+            "sensor_published": len(store._sensor_published),
+        }
+
+
+def _drop_registry_tombstones(hass: HomeAssistant) -> int:
+    """Forget the registries' records of deleted devices and entities.
+
+    HA keeps them for 30 days of wall-clock time so a returning device gets
+    its old IDs back; the soak never runs that long, so without this every
+    churned device would show up as growth that HA, not the integration, owns.
+    """
+    dropped = 0
+    for deleted in (dr.async_get(hass).deleted_devices, er.async_get(hass).deleted_entities):
+        dropped += len(deleted)
+        for key in list(deleted):
+            del deleted[key]
+    return dropped
+
+
+def _sample(soak: Soak, cycle: int) -> tuple[dict[str, Any], tracemalloc.Snapshot]:
+    soak.tombstones_dropped += _drop_registry_tombstones(soak.hass)
+    gc.collect()
+    snapshot = tracemalloc.take_snapshot().filter_traces([INTEGRATION_FILTER])
+    traced, _ = tracemalloc.get_traced_memory()
+    owned = sum(stat.size for stat in snapshot.statistics("filename"))
+    return {"cycle": cycle, "traced_kb": round(traced / 1024, 1), "integration_kb": round(owned / 1024, 1),
+            "objects": len(gc.get_objects()), "sizes": soak.sizes()}, snapshot
+
+
+async def _start_hass() -> HomeAssistant:
+    # Older plugin releases return the instance, newer ones a context manager.
+    started = async_test_home_assistant(asyncio.get_running_loop())
+    hass = await started.__aenter__() if hasattr(started, "__aenter__") else await started
+    # As the plugin's enable_custom_integrations fixture does.
+    hass.data.pop(loader.DATA_CUSTOM_COMPONENTS, None)
+    assert await async_setup_component(hass, "http", {})
+    entry = MockConfigEntry(domain=DOMAIN, data={"bridge_id": BRIDGE_ID, "shared_secret": SECRET})
+    entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+    return hass
+
+
+async def _run(args: argparse.Namespace) -> tuple[dict[str, Any], list[str]]:
+    clock = SimulatedClock()
+    store_module.monotonic = clock
+    hass = await _start_hass()
+    server = TestServer(hass.http.app)
+    await server.start_server()
+    # A plain session: the aiohttp test client keeps every response it returns.
+    session = aiohttp.ClientSession()
+
+    soak = Soak(args, hass, session, str(server.make_url("")))
+    tracemalloc.start()
+    samples: list[dict[str, Any]] = []
+    baseline = None
+    try:
+        for index in range(args.cycles):
+            clock.now += SIMULATED_SECONDS_PER_CYCLE
+            await soak.cycle(index)
+            if index + 1 == args.warmup or (index + 1 > args.warmup and (index + 1) % args.sample_every == 0):
+                await hass.async_block_till_done()
+                sample, snapshot = _sample(soak, index + 1)
+                samples.append(sample)
+                if baseline is None:
+                    baseline = snapshot
+                elif args.verbose:
+                    print(json.dumps(sample), file=sys.stderr)
+        final_snapshot = snapshot if baseline is not None else None
+    finally:
+        tracemalloc.stop()
+        await session.close()
+        await server.close()
+        await hass.async_stop(force=True)
+
+    failures: list[str] = []
+    report: dict[str, Any] = {"cycles": args.cycles, "simulated_days": round(clock.now / 86400, 2),
+                              "samples": samples, "counters": dict(soak.store.counters),
+                              "registry_tombstones_dropped": soak.tombstones_dropped}
+    if len(samples) < 2:
+        failures.append("not enough samples; raise --cycles or lower --warmup/--sample-every")
+        return report, failures
+
+    first, last = samples[0], samples[-1]
+    growth_kb = last["integration_kb"] - first["integration_kb"]
+    report["growth_kb"] = round(growth_kb, 1)
+    report["total_growth_kb"] = round(last["traced_kb"] - first["traced_kb"], 1)
+    report["object_growth"] = last["objects"] - first["objects"]
+    if growth_kb > args.max_growth_kb:
+        failures.append(f"integration memory grew {growth_kb:.1f} KiB (bound {args.max_growth_kb} KiB)")
+        report["top_growth"] = [
+            str(stat) for stat in final_snapshot.compare_to(baseline, "lineno")[:10] if stat.size_diff > 0
+        ]
+    # Containers must stay bounded by the live population, not by history.
+    orphans = args.devices * args.orphan_factor
+    bound = {"devices": orphans, "inflight": args.devices, "buckets": orphans, "throttled_devices": orphans,
+             "last_sent": orphans, "entities": orphans, "entity_registry": orphans, "device_registry": orphans,
+             "states": orphans}
+    for name, limit in bound.items():
+        if last["sizes"][name] > limit:
+            failures.append(f"{name} holds {last['sizes'][name]} entries (bound {limit})")
+    if last["sizes"]["entity_devices"] != last["sizes"]["platform_devices"]:
+        failures.append("platform entity dicts drifted from the store's platform index")
+    return report, failures
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--cycles", type=int, default=100_000, help="sync/enqueue/poll/ack cycles to run")
+    parser.add_argument("--devices", type=int, default=500, help="live device population")
+    parser.add_argument("--churn", type=float, default=0.02, help="fraction of devices replaced per full sync")
+    parser.add_argument("--full-sync-every", type=int, default=150, help="cycles between full snapshots")
+    parser.add_argument("--ack-loss", type=float, default=0.05, help="fraction of acks never sent (0-1)")
+    parser.add_argument("--warmup", type=int, default=20_000, help="cycles before the baseline sample")
+    parser.add_argument("--sample-every", type=int, default=20_000, help="cycles between samples")
+    parser.add_argument("--max-growth-kb", type=float, default=1024.0, help="allowed growth of memory allocated by the integration (KiB)")
+    parser.add_argument("--orphan-factor", type=int, default=2, help="allowed devices per live device, for orphans")
+    parser.add_argument("--seed", type=int, help="random seed for repeatable runs")
+    parser.add_argument("--verbose", action="store_true", help="print each sample to stderr as it is taken")
+    args = parser.parse_args()
+    if args.seed is not None:
+        random.seed(args.seed)
+
+    report, failures = asyncio.run(_run(args))
+    report["failures"] = failures
+    print(json.dumps(report, indent=2))
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
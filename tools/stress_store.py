@@ -0,0 +1,351 @@
+"""Stress and property-check BridgeStore under interleaved asyncio load.
+
+Concurrent producers (entity service calls), pollers (the commands view),
+ackers (the ack view) and syncers (the sync view, plus refresh requests) run
+against one store on a single event loop, the way HA interleaves them. Every
+store call is synchronous, so the interleaving happens between calls; each
+worker yields at random points from a seeded RNG, which makes any schedule
+repeatable from its seed. Time is simulated: every poll advances the clock,
+so TTLs, rate limits and ack timeouts all come into play.
+
+After each poll and after a final drain the run checks:
+
+- no lost commands: every command ID handed out is acked, expired, dropped
+  after its attempts, superseded or orphaned, and the store counters agree;
+- no duplicates: a command is delivered again only as a counted redelivery,
+  and never sits in the queue and in flight at once;
+- bounded in-flight set: nothing in flight is older than the ack timeout;
+- per-device ordering: a device never receives an older command after a
+  newer one of the same intent group (refreshes only read state and are
+  not ordered).
+
+``--runs`` repeats short runs with randomized store settings (property mode);
+the first failing seed is printed so it can be replayed with ``--seed``.
+Sustained operations per second are reported per operation type.
+
+Examples:
+    python tools/stress_store.py --ops 2000000
+    python tools/stress_store.py --runs 500 --ops 5000
+    python tools/stress_store.py --seed 1234 --ops 5000 --randomize
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+from collections import Counter
+from dataclasses import dataclass, field
+import json
+import random
+import sys
+from time import perf_counter
+from typing import Any
+
+from _common import COMMANDS, SimulatedClock, add_repo_to_path
+
+add_repo_to_path()
+
+from custom_components.control4_bridge import store as store_module  # noqa: E402
+from custom_components.control4_bridge.const import (  # noqa: E402
+    COMMAND_TTL_DEFAULTS,
+    DEFAULT_COMMAND_BATCH_SIZE,
+    DEFAULT_COMMAND_BURST,
+    DEFAULT_COMMAND_RATE,
+    DEFAULT_ORPHAN_SNAPSHOTS,
+    INFLIGHT_TIMEOUT_SECONDS,
+)
+from custom_components.control4_bridge.store import BridgeStore  # noqa: E402
+
+DRAIN_ROUNDS = 10_000
+
+
+class InvariantError(AssertionError):
+    """Raised on the first broken invariant."""
+
+
+@dataclass
+class Settings:
+    """Store and workload settings for one run."""
+
+    devices: int = 200
+    producers: int = 8
+    pollers: int = 2
+    ackers: int = 2
+    syncers: int = 2
+    command_rate: float = DEFAULT_COMMAND_RATE
+    command_burst: int = DEFAULT_COMMAND_BURST
+    batch_size: int = DEFAULT_COMMAND_BATCH_SIZE
+    orphan_snapshots: int = DEFAULT_ORPHAN_SNAPSHOTS
+    command_ttls: dict[str, float] = field(default_factory=lambda: dict(COMMAND_TTL_DEFAULTS))
+    ack_loss: float = 0.05
+    churn: float = 0.05
+    tick: float = 0.25
+    yield_chance: float = 0.3
+
+    @classmethod
+    def randomized(cls, rng: random.Random, base: Settings) -> Settings:
+        """Draw settings that reach the edge cases: tiny buckets, batches and TTLs."""
+        ttls = dict(COMMAND_TTL_DEFAULTS)
+        if rng.random() < 0.5:
+            ttls = {action: rng.choice([0, 0.5, 2, 10]) for action in ttls}
+        return cls(
+            devices=rng.choice([1, 2, 5, 20, 100]),
+            producers=rng.randint(1, 6),
+            pollers=rng.randint(1, 3),
+            ackers=rng.randint(1, 3),
+            syncers=rng.randint(0, 2),
+            command_rate=rng.choice([0, 0.5, 2, 5, 50]),
+            command_burst=rng.choice([1, 2, 10]),
+            batch_size=rng.choice([1, 3, 25]),
+            orphan_snapshots=rng.choice([1, 2, 3]),
+            command_ttls=ttls,
+            ack_loss=rng.choice([0, 0.1, 0.5, 0.9]),
+            churn=rng.choice([0, 0.2, 0.5]),
+            tick=rng.choice([0.05, 1, 10, 30]),
+            yield_chance=base.yield_chance,
+        )
+
+
+class Ledger:
+    """What the workers saw, checked against what the store reports."""
+
+    def __init__(self) -> None:
+        # command_id -> ((device_id, intent group) or None if unordered, issue order)
+        self.issued: dict[str, tuple[tuple[str, str] | None, int]] = {}
+        self.deliveries: Counter[str] = Counter()
+        self.acked: set[str] = set()
+        self.last_delivered: dict[tuple[str, str], int] = {}  # (device_id, intent group) -> issue order last delivered
+        self.ops: Counter[str] = Counter()
+
+    def issue(self, command_id: str | None, key: tuple[str, str] | None) -> None:
+        # A merged command keeps the ID, and the place, of the one it joined.
+        if command_id is not None and command_id not in self.issued:
+            self.issued[command_id] = (key, len(self.issued))
+
+    def deliver(self, command_id: str) -> None:
+        if command_id not in self.issued:
+            raise InvariantError(f"delivered {command_id}, which was never issued")
+        key, order = self.issued[command_id]
+        if key is not None:
+            if order < self.last_delivered.get(key, -1):
+                raise InvariantError(f"{key!r} received {command_id} after a newer command")
+            self.last_delivered[key] = order
+        self.deliveries[command_id] += 1
+
+
+class StressRun:
+    """One store, its device population and the workers that load it."""
+
+    def __init__(self, settings: Settings, seed: int, ops: int) -> None:
+        self.settings = settings
+        self.rng = random.Random(seed)
+        self.budget = ops
+        self.clock = SimulatedClock()
+        store_module.monotonic = self.clock
+        self.store = BridgeStore(
+            "stress",
+            orphan_snapshots=settings.orphan_snapshots,
+            command_batch_size=settings.batch_size,
+            command_ttls=settings.command_ttls,
+            command_rate=settings.command_rate,
+            command_burst=settings.command_burst,
+        )
+        self.ledger = Ledger()
+        self.next_device = 0
+        self.devices: dict[str, dict[str, Any]] = {}
+        for _ in range(settings.devices):
+            self._new_device()
+        self.store.upsert_devices(list(self.devices.values()))
+        self.acks: asyncio.Queue[list[str]] = asyncio.Queue()
+        self.producing = True
+
+    def _new_device(self) -> None:
+        device_id = str(self.next_device)
+        self.next_device += 1
+        device_type = self.rng.choice(list(COMMANDS))
+        self.devices[device_id] = {"device_id": device_id, "name": f"Stress {device_id}", "type": device_type,
+                                   "state": {"level": 0}}
+
+    async def _yield(self) -> None:
+        if self.rng.random() < self.settings.yield_chance:
+            await asyncio.sleep(0)
+
+    def _spend(self, kind: str) -> bool:
+        if self.budget <= 0:
+            return False
+        self.budget -= 1
+        self.ledger.ops[kind] += 1
+        return True
+
+    async def produce(self) -> None:
+        while self.producing and self._spend("enqueue"):
+            device_id = self.rng.choice(list(self.devices))
+            action, params = self.rng.choice(COMMANDS[self.devices[device_id]["type"]])
+            command_id = self.store.enqueue_command(device_id, action, dict(params))
+            self.ledger.issue(command_id, store_module._intent_key(device_id, action))
+            await self._yield()
+        self.producing = False
+
+    async def poll(self) -> None:
+        while self.producing:
+            self.poll_once()
+            await self._yield()
+            await asyncio.sleep(0)
+
+    def poll_once(self) -> list[str]:
+        store = self.store
+        self.clock.now += self.settings.tick
+        self.ledger.ops["poll"] += 1
+        command_ids = [command.command_id for command in store.pop_commands(store.command_batch_size)]
+        for command_id in command_ids:
+            self.ledger.deliver(command_id)
+        self.check()
+        lost = self.rng.random() < self.settings.ack_loss
+        if command_ids and not lost:
+            self.acks.put_nowait(command_ids)
+        return command_ids
+
+    async def ack(self) -> None:
+        while True:
+            command_ids = await self.acks.get()
+            await self._yield()
+            self.ack_batch(command_ids)
+            self.acks.task_done()
+
+    def ack_batch(self, command_ids: list[str]) -> None:
+        self.ledger.ops["ack"] += 1
+        # Acks can arrive after a redelivery; only the ones still in flight count.
+        self.ledger.acked.update(command_id for command_id in command_ids if command_id in self.store._inflight)
+        self.store.ack_commands(command_ids)
+
+    async def sync(self) -> None:
+        store = self.store
+        while self.producing and self._spend("sync"):
+            if self.rng.random() < 0.1:
+                for device_id in self.rng.sample(list(self.devices), int(len(self.devices) * self.settings.churn)):
+                    del self.devices[device_id]
+                    self._new_device()
+                result = store.upsert_devices(list(self.devices.values()))
+                store.mark_snapshot_applied(result, False)
+                store.reconcile_snapshot(result)
+            else:
+                records = self.rng.sample(list(self.devices.values()), min(3, len(self.devices)))
+                for record in records:
+                    record["state"] = {"level": self.rng.randrange(100)}
+                store.mark_snapshot_applied(store.upsert_devices(records), True)
+            if self.rng.random() < 0.2:
+                self.ledger.issue(store.request_refresh(self.rng.sample(list(store.devices), 1)), None)
+            await self._yield()
+
+    def check(self) -> None:
+        store = self.store
+        queued = [command.command_id for command in store._commands]
+        if len(queued) != len(set(queued)):
+            raise InvariantError("a command is queued twice")
+        if overlap := set(queued) & store._inflight.keys():
+            raise InvariantError(f"{sorted(overlap)[:3]} are queued and in flight at once")
+        oldest = next(iter(store._inflight.values()), None)
+        if oldest is not None and oldest.sent_at <= self.clock.now - INFLIGHT_TIMEOUT_SECONDS:
+            raise InvariantError(f"{oldest.command_id} stayed in flight past the ack timeout")
+
+    async def drain(self) -> None:
+        """Stop producing, then poll and ack until the store holds no commands."""
+        await self.acks.join()
+        store = self.store
+        for _ in range(DRAIN_ROUNDS):
+            if not (store._commands or store._deferred or store._inflight):
+                return
+            if not self.poll_once():
+                self.clock.now += INFLIGHT_TIMEOUT_SECONDS / 4
+            while not self.acks.empty():
+                self.ack_batch(self.acks.get_nowait())
+                self.acks.task_done()
+        raise InvariantError("the queue did not drain")
+
+    def account(self) -> None:
+        """Every issued command must have exactly one accounted-for outcome."""
+        counters = self.store.counters
+        ledger = self.ledger
+        dropped = sum(counters[name] for name in
+                      ("commands_expired", "commands_unacked", "commands_superseded", "commands_orphaned"))
+        if len(ledger.issued) != len(ledger.acked) + dropped:
+            raise InvariantError(
+                f"{len(ledger.issued)} commands issued, {len(ledger.acked)} acked and {dropped} dropped"
+            )
+        repeats = sum(ledger.deliveries.values()) - len(ledger.deliveries)
+        if repeats > counters["commands_redelivered"]:
+            raise InvariantError(
+                f"{repeats} repeat deliveries, {counters['commands_redelivered']} counted redeliveries"
+            )
+
+    async def run(self) -> None:
+        s = self.settings
+        ackers = [asyncio.create_task(self.ack()) for _ in range(s.ackers)]
+        try:
+            await asyncio.gather(
+                *(self.produce() for _ in range(s.producers)),
+                *(self.poll() for _ in range(s.pollers)),
+                *(self.sync() for _ in range(s.syncers)),
+            )
+            await self.drain()
+        finally:
+            for task in ackers:
+                task.cancel()
+        self.account()
+
+
+async def _run_once(settings: Settings, seed: int, ops: int) -> StressRun:
+    run = StressRun(settings, seed, ops)
+    await run.run()
+    return run
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--ops", type=int, default=1_000_000, help="enqueue and sync operations per run")
+    parser.add_argument("--runs", type=int, default=1, help="seeded runs; more than 1 randomizes the settings")
+    parser.add_argument("--randomize", action="store_true", help="randomize the settings of a single run")
+    parser.add_argument("--seed", type=int, help="seed of the first run; later runs use the following seeds")
+    parser.add_argument("--devices", type=int, default=200, help="live device population")
+    parser.add_argument("--producers", type=int, default=8, help="concurrent command producers")
+    parser.add_argument("--pollers", type=int, default=2, help="concurrent pollers")
+    parser.add_argument("--ackers", type=int, default=2, help="concurrent ackers")
+    parser.add_argument("--syncers", type=int, default=2, help="concurrent syncers")
+    parser.add_argument("--command-rate", type=float, default=DEFAULT_COMMAND_RATE,
+                        help="per-device commands per second; 0 disables rate limiting")
+    parser.add_argument("--ack-loss", type=float, default=0.05, help="fraction of poll batches never acked (0-1)")
+    args = parser.parse_args()
+
+    first_seed = args.seed if args.seed is not None else random.randrange(2**32)
+    base = Settings(devices=args.devices, producers=args.producers, pollers=args.pollers, ackers=args.ackers,
+                    syncers=args.syncers, command_rate=args.command_rate, ack_loss=args.ack_loss)
+    ops: Counter[str] = Counter()
+    counters: Counter[str] = Counter()
+    failure = None
+    started = perf_counter()
+    for seed in range(first_seed, first_seed + args.runs):
+        settings = Settings.randomized(random.Random(seed), base) if args.runs > 1 or args.randomize else base
+        try:
+            run = asyncio.run(_run_once(settings, seed, args.ops))
+        except InvariantError as err:
+            failure = {"seed": seed, "error": str(err), "settings": settings.__dict__}
+            break
+        ops.update(run.ledger.ops)
+        counters.update(run.store.counters)
+    elapsed = perf_counter() - started
+
+    report: dict[str, Any] = {
+        "runs": args.runs,
+        "first_seed": first_seed,
+        "seconds": round(elapsed, 2),
+        "ops_per_second": {kind: round(count / elapsed) for kind, count in ops.items()},
+        "total_ops_per_second": round(sum(ops.values()) / elapsed),
+        "counters": dict(counters),
+        "failure": failure,
+    }
+    print(json.dumps(report, indent=2))
+    sys.exit(1 if failure else 0)
+
+
+if __name__ == "__main__":
+    main()